@@ -0,0 +1,150 @@
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ConnectionPool:
+    """
+    A small thread-safe pool of reusable connection handles.
+
+    Connections are created lazily with the `connect` callable, lent out with
+    `acquire()` / `connection()`, and returned to an idle queue instead of being
+    closed, so repeated operations against the same backend skip the TCP/TLS and
+    authentication handshake. Idle connections that fail the optional `is_alive`
+    check are closed and replaced transparently.
+    """
+
+    def __init__(self,
+                 connect: Callable[[], Any],
+                 close: Optional[Callable[[Any], None]] = None,
+                 is_alive: Optional[Callable[[Any], bool]] = None,
+                 max_idle: int = 4):
+        """
+        Args:
+            connect (Callable[[], Any]): Opens a brand-new connection.
+            close (Callable[[Any], None] | None): Closes a connection. Defaults to
+                                                  calling `conn.close()`.
+            is_alive (Callable[[Any], bool] | None): Cheap liveness check run on an
+                                                     idle connection before it is
+                                                     lent out. Defaults to no check.
+            max_idle (int): Maximum number of idle connections kept open. Extra
+                            connections are closed when released.
+        """
+        self._connect = connect
+        self._close = close or (lambda conn: conn.close())
+        self._is_alive = is_alive
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=max_idle)
+        self._closed = False
+
+    def acquire(self) -> Any:
+        """
+        Lends out an idle connection, or opens a new one if none is usable.
+
+        Returns:
+            Any: A live connection. Hand it back with `release()` or `discard()`.
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            if self._is_alive is None or self._safe_is_alive(conn):
+                return conn
+            self._safe_close(conn)
+
+    def release(self, conn: Any) -> None:
+        """Returns a healthy connection to the idle queue, closing it if the pool is full or closed."""
+        if self._closed:
+            self._safe_close(conn)
+            return
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._safe_close(conn)
+
+    def discard(self, conn: Any) -> None:
+        """Closes a connection that should not be reused (e.g. after a connection error)."""
+        self._safe_close(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that lends out a connection and returns it afterwards.
+        A connection whose block raised is discarded rather than reused.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            self.discard(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def close(self) -> None:
+        """Closes every idle connection and stops accepting returned ones."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._safe_close(conn)
+
+    def _safe_is_alive(self, conn: Any) -> bool:
+        try:
+            return bool(self._is_alive(conn))
+        except Exception:
+            return False
+
+    def _safe_close(self, conn: Any) -> None:
+        try:
+            self._close(conn)
+        except Exception:
+            # A connection that cannot be closed cleanly is simply dropped
+            pass
+
+
+# Process-wide registry of pools, keyed by whatever identifies a backend
+# (e.g. a system name, or a tuple of account/user/database for Snowflake).
+_POOLS: Dict[Hashable, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(key: Hashable, connect: Callable[[], Any], **pool_kwargs: Any) -> ConnectionPool:
+    """
+    Returns the pool registered under `key`, creating it on first use.
+
+    Args:
+        key (Hashable): Identifies the backend. Must not contain secrets.
+        connect (Callable[[], Any]): Opens a new connection; only used when the
+                                     pool is created.
+        **pool_kwargs: Extra `ConnectionPool` arguments (close, is_alive, max_idle).
+
+    Returns:
+        ConnectionPool: The shared pool for this backend.
+    """
+    pool = _POOLS.get(key)
+    if pool is not None:
+        return pool
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = ConnectionPool(connect, **pool_kwargs)
+            _POOLS[key] = pool
+        return pool
+
+
+def close_all_pools() -> None:
+    """Closes and forgets every registered pool. Registered to run at interpreter exit."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
@@ -3,6 +3,47 @@ import inspect
 import json
 import logging
 import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+
+class LazyDetail:
+    """
+    A deferred value for `other_details`.
+
+    Wraps a zero-argument callable that builds an expensive payload (e.g. a
+    per-field summary of a large record). The callable only runs when
+    `CustomLogFormatter` actually formats the record, so nothing is computed
+    for records that are filtered out or never reach a handler.
+    """
+    __slots__ = ('_build',)
+
+    def __init__(self, build: Callable[[], Any]):
+        """
+        Args:
+            build (Callable[[], Any]): Returns the value to log. It should be
+                                       JSON-serializable; anything else is
+                                       logged via `str()`.
+        """
+        self._build = build
+
+    def resolve(self) -> Any:
+        """Builds and returns the deferred value."""
+        return self._build()
+
+
+def _json_default(value: Any) -> Any:
+    """
+    `json.dumps` fallback for `other_details` values: resolves `LazyDetail`
+    payloads and renders anything else that is not JSON-serializable
+    (datetimes, Decimals, ...) with `str()`.
+    """
+    if isinstance(value, LazyDetail):
+        return value.resolve()
+    return str(value)
+
 
 class CustomLogFormatter(logging.Formatter):
     """
@@ -45,7 +86,7 @@ class CustomLogFormatter(logging.Formatter):
         if other_details is not None:
             try:
                 # Use json.dumps for pretty printing with 4-space indentation
-                other_details_display = f"\nOther Details:\n{json.dumps(other_details, indent=4)}"
+                other_details_display = f"\nOther Details:\n{json.dumps(other_details, indent=4, default=_json_default)}"
             except TypeError:
                 # Fallback for non-JSON serializable objects in other_details
                 other_details_display = f"\nOther Details:\n{other_details}"
@@ -129,6 +170,21 @@ class CustomLogger:
             # output if the root logger also has handlers configured.
             # self._logger.propagate = False
 
+    def isEnabledFor(self, level: int) -> bool:
+        """
+        Reports whether a message of the given level would be emitted.
+
+        Mirrors `logging.Logger.isEnabledFor` so callers can skip building
+        expensive messages or `other_details` payloads for filtered levels.
+
+        Args:
+            level (int): The standard logging level (e.g., `logging.DEBUG`).
+
+        Returns:
+            bool: True if this logger instance would handle the level.
+        """
+        return self._logger.isEnabledFor(level)
+
     def _get_caller_info(self) -> str:
         """
         Retrieves the file name and line number of the code that invoked
@@ -171,6 +227,11 @@ class CustomLogger:
             other_details (dict | None): An optional dictionary containing additional
                                          structured details for the log entry.
         """
+        # Bail out before any formatting work when the level is filtered out.
+        # Caller inspection walks the whole stack, so it must not run for dropped records.
+        if not self._logger.isEnabledFor(level):
+            return
+
         # Determine the effective parent and child IDs for the current log record
         effective_parent_id = parent_id if parent_id is not None else self._instance_parent_id
         effective_child_id = child_id if child_id is not None else self._instance_child_id
@@ -253,6 +314,113 @@ class CustomLogger:
         """
         self._log(logging.CRITICAL, message, parent_id, child_id, keyword, other_details)
 
+    def emit_batch(self, entries: Iterable[Tuple[int, str | None, str | None, str | None, str, dict | None, float, str]]):
+        """
+        Emits log entries collected earlier (see `BatchingLoggerProxy`) in one call.
+
+        Each entry keeps the creation time and caller captured when it was buffered, so
+        the output is identical to logging the entries one by one at that time.
+
+        Args:
+            entries: (level, message, parent_id, child_id, keyword, other_details,
+                      created, caller_info) tuples, in the order they were logged.
+        """
+        logger = self._logger
+        for level, message, parent_id, child_id, keyword, other_details, created, caller_info in entries:
+            if not logger.isEnabledFor(level):
+                continue
+            record = logger.makeRecord(
+                logger.name, level, caller_info, 0, message if message is not None else "", None, None,
+                extra={
+                    'parent_id': parent_id if parent_id is not None else self._instance_parent_id,
+                    'child_id': child_id if child_id is not None else self._instance_child_id,
+                    'keyword': keyword,
+                    'other_details': other_details,
+                    'caller_info': caller_info
+                }
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            logger.handle(record)
+
+
+class BatchingLoggerProxy:
+    """
+    Stands in for a `CustomLogger` and keeps log calls in memory until `flush()`.
+
+    Exposes the same logging methods and `isEnabledFor`, so it can be passed to code
+    that expects a `CustomLogger`. Entries for disabled levels are dropped immediately;
+    the rest are handed to `CustomLogger.emit_batch` in order on `flush()`. The caller
+    is recorded from the calling frame instead of `inspect.stack()`, and the creation
+    time is kept, so flushed records read as if they had been logged directly.
+    """
+
+    def __init__(self, logger: CustomLogger):
+        """
+        Args:
+            logger (CustomLogger): The logger that receives the entries on flush.
+        """
+        self._target = logger
+        self._entries: list = []
+
+    def isEnabledFor(self, level: int) -> bool:
+        """Reports whether the wrapped logger would emit a message of the given level."""
+        return self._target.isEnabledFor(level)
+
+    def _buffer(self, level: int, message: str | None, parent_id: str | None, child_id: str | None,
+                keyword: str, other_details: dict | None):
+        if not self._target.isEnabledFor(level):
+            return
+        # [0] is _buffer, [1] the public method (info, ...), [2] the calling code
+        caller_frame = sys._getframe(2)
+        caller_info = f"{os.path.basename(caller_frame.f_code.co_filename)}:{caller_frame.f_lineno}"
+        self._entries.append((level, message, parent_id, child_id, keyword, other_details, time.time(), caller_info))
+
+    def debug(self, message: str | None = None, parent_id: str | None = None, child_id: str | None = None, keyword: str = "", other_details: dict | None = None):
+        """Buffers a message with the DEBUG level."""
+        self._buffer(logging.DEBUG, message, parent_id, child_id, keyword, other_details)
+
+    def info(self, message: str | None = None, parent_id: str | None = None, child_id: str | None = None, keyword: str = "", other_details: dict | None = None):
+        """Buffers a message with the INFO level."""
+        self._buffer(logging.INFO, message, parent_id, child_id, keyword, other_details)
+
+    def warning(self, message: str | None = None, parent_id: str | None = None, child_id: str | None = None, keyword: str = "", other_details: dict | None = None):
+        """Buffers a message with the WARNING level."""
+        self._buffer(logging.WARNING, message, parent_id, child_id, keyword, other_details)
+
+    def error(self, message: str | None = None, parent_id: str | None = None, child_id: str | None = None, keyword: str = "", other_details: dict | None = None):
+        """Buffers a message with the ERROR level."""
+        self._buffer(logging.ERROR, message, parent_id, child_id, keyword, other_details)
+
+    def critical(self, message: str | None = None, parent_id: str | None = None, child_id: str | None = None, keyword: str = "", other_details: dict | None = None):
+        """Buffers a message with the CRITICAL level."""
+        self._buffer(logging.CRITICAL, message, parent_id, child_id, keyword, other_details)
+
+    def flush(self):
+        """Emits every buffered entry through the wrapped logger and empties the buffer."""
+        entries, self._entries = self._entries, []
+        if entries:
+            self._target.emit_batch(entries)
+
+
+@contextmanager
+def batched_logging(logger) -> Iterator[Any]:
+    """
+    Context manager that yields a `BatchingLoggerProxy` for `logger` and flushes it on
+    exit, including when the block raises.
+
+    If `logger` is already a proxy it is yielded unchanged and left for its owner to
+    flush, so nested batched sections emit once, at the outermost exit.
+    """
+    if isinstance(logger, BatchingLoggerProxy):
+        yield logger
+        return
+    proxy = BatchingLoggerProxy(logger)
+    try:
+        yield proxy
+    finally:
+        proxy.flush()
+
 
 
 import multiprocessing
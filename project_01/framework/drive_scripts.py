@@ -1,14 +1,76 @@
 import re
-import pytz
+import csv
 import json
+import collections
+import os
+import uuid
+import logging
+import functools
+import hashlib
+import tempfile
 from contextlib import contextmanager
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Union
 
 import snowflake.connector
 from snowflake.connector import DictCursor
 
-from custom_logger import CustomLogger
+from connection_pools import get_pool
+from custom_logger import CustomLogger, LazyDetail
+
+
+# Both validators only check which keys are present, so a key set that passed once
+# always passes again. Remembering the passing key sets turns repeat validations of
+# the same config shape into a set lookup, with no re-scan or logs.
+_VALIDATED_SF_CONFIG_KEYS: set = set()
+_VALIDATED_CONFIG_KEYS: set = set()
+
+_REQUIRED_SF_KEYS = frozenset(('account', 'user', 'password', 'warehouse', 'database', 'schema', 'table'))
+_REQUIRED_PIPELINE_KEYS = frozenset(('PIPELINE_NAME', 'SOURCE_NAME', 'SOURCE_CATEGORY', 'SOURCE_SUB_TYPE'))
+
+# Session settings sent with the login request instead of as separate ALTER SESSION
+# statements. sf_config['session_parameters'] adds to or overrides these.
+_DEFAULT_SESSION_PARAMETERS = {'QUERY_TAG': 'drive_scripts'}
+
+# Result chunk download threads per connection
+_PREFETCH_THREADS = min(8, os.cpu_count() or 1)
+
+# Above this many records, inserts are staged as a CSV file and loaded with COPY INTO
+# instead of being sent as a bound multi-row INSERT
+BULK_STAGE_THRESHOLD = 50
+
+# The drive table columns stale detection reads or resets. Pass as `columns` to the
+# record lookups to fetch only these instead of every column of the wide drive table.
+STALE_DETECTION_COLUMNS = (
+    'PIPELINE_ID', 'PIPELINE_STATUS', 'QUERY_WINDOW_START_TIME', 'QUERY_WINDOW_END_TIME',
+    'PIPELINE_START_TIME', 'PIPELINE_END_TIME', 'PIPELINE_DURATION', 'PIPELINE_EXP_DURATION',
+    'SRC_STG_XFER_STATUS', 'SRC_STG_XFER_START_TS', 'SRC_STG_XFER_END_TS', 'SRC_STG_XFER_DURATION',
+    'SRC_STG_AUDIT_STATUS', 'SRC_STG_AUDIT_START_TS', 'SRC_STG_AUDIT_END_TS', 'SRC_STG_AUDIT_DURATION',
+    'STG_TGT_XFER_STATUS', 'STG_TGT_XFER_START_TS', 'STG_TGT_XFER_END_TS', 'STG_TGT_XFER_DURATION',
+    'STG_TGT_AUDIT_STATUS', 'STG_TGT_AUDIT_START_TS', 'STG_TGT_AUDIT_END_TS', 'STG_TGT_AUDIT_DURATION',
+    'SRC_TGT_AUDIT_STATUS', 'SRC_TGT_AUDIT_START_TS', 'SRC_TGT_AUDIT_END_TS', 'SRC_TGT_AUDIT_DURATION',
+    'RETRY_ATTEMPT_NUMBER'
+)
+
+# Duration strings such as '2d3h9s': one (amount, unit) pair per match
+_DURATION_RE = re.compile(r"(\d+)([dhms])")
+_UNIT_SECONDS = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+# Durations configs use most often, answered without the regex or the parse cache
+_COMMON_DURATIONS = {'30s': 30, '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+                     '1h': 3600, '6h': 21600, '12h': 43200, '1d': 86400}
+
+# Named pyformat placeholders such as %(PIPELINE_ID)s
+_PLACEHOLDER_RE = re.compile(r"%\((\w+)\)s")
+
+
+def _sql_literal(value: Any) -> str:
+    """Renders a bound value as SQL text, for logging manually runnable queries only."""
+    return f"'{value}'" if isinstance(value, str) else str(value)
+
+
+def reset_validation_cache() -> None:
+    """Forgets every config shape that passed validation, forcing full re-validation."""
+    _VALIDATED_SF_CONFIG_KEYS.clear()
+    _VALIDATED_CONFIG_KEYS.clear()
 
 
 def validate_sf_config(sf_config: Dict[str, Any], logger: CustomLogger) -> None:
@@ -16,6 +78,10 @@ def validate_sf_config(sf_config: Dict[str, Any], logger: CustomLogger) -> None:
     Validate Snowflake configuration has all required keys.
     The logger instance is passed as an argument.
     """
+    config_keys = frozenset(sf_config)
+    if config_keys in _VALIDATED_SF_CONFIG_KEYS:
+        return
+
     # Define a consistent keyword for all logs within this function
     KEYWORD_SF_CONFIG_VALIDATION = "SF_CONFIG_VALIDATION"
 
@@ -26,12 +92,7 @@ def validate_sf_config(sf_config: Dict[str, Any], logger: CustomLogger) -> None:
         other_details={"input_config_type": type(sf_config).__name__, "config_keys": list(sf_config.keys())}
     )
 
-    required_keys = ['account', 'user', 'password', 'warehouse', 'database', 'schema', 'table']
-    missing_keys = [key for key in required_keys if key not in sf_config]
-    
-    # This print statement is for quick, interactive debugging.
-    # It will not be part of the final, structured log output.
-    print(f"DEBUG: missing_keys found: {missing_keys}")
+    missing_keys = sorted(_REQUIRED_SF_KEYS - config_keys)
     
     if missing_keys:
         error_msg = f"Missing required sf_config keys: {missing_keys}"
@@ -48,106 +109,119 @@ def validate_sf_config(sf_config: Dict[str, Any], logger: CustomLogger) -> None:
     logger.info(
         message="Snowflake configuration validation passed successfully.",
         keyword=KEYWORD_SF_CONFIG_VALIDATION,
-        other_details={"validation_status": "SUCCESS", "validated_keys": required_keys}
+        other_details={"validation_status": "SUCCESS", "validated_keys": sorted(_REQUIRED_SF_KEYS)}
     )
+    _VALIDATED_SF_CONFIG_KEYS.add(config_keys)
 
 
 def validate_pipeline_id(pipeline_id: Optional[str]) -> str:
     """Validate PIPELINE_ID is not None, empty, or whitespace."""
-    print(f"DEBUG: validate_pipeline_id() called")
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    
-    if pipeline_id is None:
-        error_msg = "PIPELINE_ID cannot be None, empty, or whitespace"
-        print(f"DEBUG: {error_msg}")
-        raise ValueError(error_msg)
-    
-    if not isinstance(pipeline_id, str):
-        error_msg = f"PIPELINE_ID must be a string, got: {type(pipeline_id)}"
-        print(f"DEBUG: {error_msg}")
-        raise ValueError(error_msg)
     
-    if not pipeline_id.strip():
-        error_msg = f"PIPELINE_ID cannot be empty or whitespace, length: {len(pipeline_id)}"
-        print(f"DEBUG: {error_msg}")
-        raise ValueError(error_msg)
+    # Strip once; the message is only built on the failure path
+    if isinstance(pipeline_id, str) and (cleaned_id := pipeline_id.strip()):
+        return cleaned_id
     
-    cleaned_id = pipeline_id.strip()
-    print(f"DEBUG: cleaned_id: {cleaned_id} | datatype: {type(cleaned_id)}")
-    return cleaned_id
+    error_msg = f"PIPELINE_ID must be a non-empty, non-whitespace string, got: {pipeline_id!r} ({type(pipeline_id).__name__})"
+    raise ValueError(error_msg)
 
 
 def validate_config_structure(config: Dict[str, Any]) -> None:
     """Validate main config has required structure."""
-    print(f"DEBUG: validate_config_structure() called")
-    #  print(f"DEBUG: config: {type(config)}")
+    config_keys = frozenset(config)
+    if config_keys in _VALIDATED_CONFIG_KEYS:
+        return
     
     if "sf_drive_config" not in config:
-        print(f"DEBUG: config_keys: {list(config.keys())} | datatype: {type(config.keys())}")
         error_msg = "Config must contain 'sf_drive_config' key"
-        print(f"DEBUG: {error_msg}")
         raise ValueError(error_msg)
     
-    required_pipeline_keys = ['PIPELINE_NAME', 'SOURCE_NAME', 'SOURCE_CATEGORY', 'SOURCE_SUB_TYPE']
-    missing_keys = [key for key in required_pipeline_keys if key not in config]
-    
-    print(f"DEBUG: missing_pipeline_keys: {missing_keys} | datatype: {type(missing_keys)}")
+    missing_keys = sorted(_REQUIRED_PIPELINE_KEYS - config_keys)
     
     if missing_keys:
-        available_keys = [k for k in config.keys() if k != 'password']
         error_msg = f"Missing required config keys: {missing_keys}"
-        print(f"DEBUG: available_config_keys: {available_keys} | datatype: {type(available_keys)}")
-        print(f"DEBUG: {error_msg}")
         raise ValueError(error_msg)
     
-    print(f"DEBUG: Config structure validation passed")
+    _VALIDATED_CONFIG_KEYS.add(config_keys)
+
+
+
+def _session_parameters(sf_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Session parameters sent at login: the defaults plus sf_config['session_parameters']."""
+    return {**_DEFAULT_SESSION_PARAMETERS, **sf_config.get('session_parameters', {})}
 
 
+def _snowflake_pool_key(sf_config: Dict[str, Any]) -> tuple:
+    """
+    Identifies the Snowflake backend and login a connection belongs to.
+
+    Session parameters are part of the key, so configs that differ only in them (e.g.
+    TIMEZONE) never share sessions. The password is represented by a fingerprint
+    rather than its value; a rotated password gets a new pool, whose connections are
+    opened with the new config.
+    """
+    password_fingerprint = hashlib.sha256(str(sf_config['password']).encode('utf-8')).hexdigest()[:16]
+    return ('snowflake', sf_config['account'], sf_config['user'], sf_config['warehouse'],
+            sf_config['database'], sf_config['schema'],
+            tuple(sorted(_session_parameters(sf_config).items())), password_fingerprint)
+
+
+def _redacted_sf_config(sf_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of sf_config that is safe to log. Only called on error paths."""
+    return {**sf_config, 'password': '[REDACTED]'}
+
+
+def _open_snowflake_connection(sf_config: Dict[str, Any]):
+    """Opens a new long-lived Snowflake connection for the pool."""
+    return snowflake.connector.connect(
+        account=sf_config['account'],
+        user=sf_config['user'],
+        password=sf_config['password'],
+        warehouse=sf_config['warehouse'],
+        database=sf_config['database'],
+        schema=sf_config['schema'],
+        # Pooled connections can sit idle between pipeline steps; keep the session from expiring
+        client_session_keep_alive=True,
+        # Download result chunks in parallel, without more threads than the host has cores
+        client_prefetch_threads=_PREFETCH_THREADS,
+        session_parameters=_session_parameters(sf_config)
+    )
+
+
+def _snowflake_pool(sf_config: Dict[str, Any]):
+    """The shared connection pool for this Snowflake login (see _snowflake_pool_key)."""
+    return get_pool(
+        _snowflake_pool_key(sf_config),
+        lambda: _open_snowflake_connection(sf_config),
+        is_alive=lambda c: not c.is_closed()
+    )
+
 
 @contextmanager
 def get_snowflake_connection(sf_config: Dict[str, Any], logger: CustomLogger):
     """
-    Context manager for Snowflake connections with automatic cleanup.
+    Context manager that lends out a pooled Snowflake connection.
     The logger instance is passed as an argument.
+
+    Connections are shared per (account, user, warehouse, database, schema, session
+    parameters, password) and returned to the pool afterwards instead of being closed, so repeated calls skip
+    the login handshake. A connection whose block raised is closed rather than reused.
     """
     KEYWORD_SF_CONNECTION = "SF_CONNECTION"
     conn = None
+    pool = None
 
     try:
-        # Log the attempt to establish a connection
-        logger.info(
-            message="Attempting to establish Snowflake connection.",
-            keyword=KEYWORD_SF_CONNECTION,
-            other_details={
-                "account": sf_config.get('account'),
-                "database": sf_config.get('database'),
-                "schema": sf_config.get('schema')
-            }
-        )
+        pool = _snowflake_pool(sf_config)
+        conn = pool.acquire()
 
-        conn = snowflake.connector.connect(
-            account=sf_config['account'],
-            user=sf_config['user'],
-            password=sf_config['password'],
-            warehouse=sf_config['warehouse'],
-            database=sf_config['database'],
-            schema=sf_config['schema']
-        )
-        
-        # Log successful connection
-        logger.info(
-            message=f"Snowflake connection established successfully to {sf_config['database']}.{sf_config['schema']}",
+        # Lending a pooled connection happens on every call; keep it out of INFO
+        logger.debug(
+            message=f"Snowflake connection acquired successfully for {sf_config['database']}.{sf_config['schema']}",
             keyword=KEYWORD_SF_CONNECTION,
             other_details={"status": "SUCCESS"}
         )
         
-        yield conn
-        
     except Exception as e:
-        # Prepare a safe configuration dictionary to log, redacting sensitive information
-        safe_config = {k: v for k, v in sf_config.items() if k != 'password'}
-        safe_config['password'] = '[REDACTED]'
-        
         # Log the connection failure with comprehensive details, including the full config for debugging
         logger.error(
             message=f"Failed to establish Snowflake connection: {e}",
@@ -156,58 +230,88 @@ def get_snowflake_connection(sf_config: Dict[str, Any], logger: CustomLogger):
                 "status": "FAILED",
                 "exception_type": type(e).__name__,
                 "exception_message": str(e),
-                "provided_config": safe_config
+                "provided_config": _redacted_sf_config(sf_config)
             }
         )
-        # Add a print statement for quick, non-formatted debugging if needed
-        print(f"DEBUG: Connection failed - exception: {str(e)}")
         raise
-        
-    finally:
-        if conn:
-            try:
-                conn.close()
-                # Log successful connection closure
-                logger.info(
-                    message="Snowflake connection closed successfully.",
-                    keyword=KEYWORD_SF_CONNECTION,
-                    other_details={"status": "CLOSED"}
-                )
-            except Exception as e:
-                # Log any errors that occur during connection closure
-                logger.error(
-                    message=f"Error while closing Snowflake connection: {e}",
-                    keyword=KEYWORD_SF_CONNECTION,
-                    other_details={
-                        "status": "CLOSE_FAILED",
-                        "exception_type": type(e).__name__,
-                        "exception_message": str(e)
-                    }
-                )
 
+    try:
+        yield conn
+    except GeneratorExit:
+        # A streaming caller stopped reading early, as the iter_* functions allow; the
+        # cursor may still hold an unread result, so the connection is not reused
+        pool.discard(conn)
+        logger.debug(
+            message="Snowflake connection discarded after the caller stopped reading.",
+            keyword=KEYWORD_SF_CONNECTION,
+            other_details={"status": "DISCARDED"}
+        )
+        raise
+    except BaseException:
+        # The connection may be mid-transaction or broken; do not hand it to the next caller
+        pool.discard(conn)
+        logger.info(
+            message="Snowflake connection discarded after an error.",
+            keyword=KEYWORD_SF_CONNECTION,
+            other_details={"status": "DISCARDED"}
+        )
+        raise
+    else:
+        pool.release(conn)
+        logger.debug(
+            message="Snowflake connection returned to pool.",
+            keyword=KEYWORD_SF_CONNECTION,
+            other_details={"status": "RELEASED"}
+        )
 
 
-def find_in_process_records(config: Dict[str, Any], logger: CustomLogger) -> List[Dict[str, Any]]:
-    """Finds all records with in_process status from drive table.
-       whose 
-       CONTINUITY_CHECK_PERFORMED = 'YES' 
-       and
-       CAN_FETCH_HISTORICAL_DATA = 'YES' 
-       are must
-      """
-    print(f"DEBUG: find_in_process_records() called")
-    #  print(f"DEBUG: config: {type(config)}")
-    
-    validate_config_structure(config)
-    
-    sf_config = config["sf_drive_config"]
-    table_name = sf_config["table"]
-    
-    print(f"DEBUG: table_name: {table_name} ")
-    
-    # Build query directly in function - no need to separate
+def test_drive_connection(config: Dict[str, Any]) -> bool:
+    """
+    Health-check probe for the drive Snowflake database.
+
+    Pings a pooled connection with SELECT 1 and hands it back to the pool, so the
+    pipeline work that follows reuses the already-authenticated session. A pooled
+    session can die while idle without is_closed() noticing; if the ping fails the
+    connection is discarded and one fresh connection is tried before reporting the
+    drive as unavailable.
+
+    Returns:
+        bool: True if the drive database answered.
+    """
+    pool = _snowflake_pool(config["sf_drive_config"])
+
+    for _ in range(2):
+        try:
+            conn = pool.acquire()
+        except Exception:
+            # A fresh login failed; retrying it straight away will not help
+            return False
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        except Exception:
+            pool.discard(conn)
+            continue
+
+        pool.release(conn)
+        return True
+
+    return False
+
+
+def _select_list(columns: Optional[Iterable[str]]) -> str:
+    """SELECT list for the given column names; None selects every column."""
+    return "*" if columns is None else ", ".join(columns)
+
+
+@functools.lru_cache(maxsize=32)
+def _in_process_records_sql(table_name: str, columns: Optional[tuple], order: bool, limit: bool,
+                            stale_only: bool = False) -> str:
+    """Build (once per table and shape) the IN_PROCESS records query text."""
     query = f"""
-    SELECT * FROM {table_name}
+    SELECT {_select_list(columns)} FROM {table_name}
     WHERE 
     PIPELINE_STATUS = %(PIPELINE_STATUS)s 
     AND CONTINUITY_CHECK_PERFORMED = 'YES' 
@@ -216,10 +320,36 @@ def find_in_process_records(config: Dict[str, Any], logger: CustomLogger) -> Lis
     AND SOURCE_NAME = %(SOURCE_NAME)s
     AND SOURCE_CATEGORY = %(SOURCE_CATEGORY)s 
     AND SOURCE_SUB_TYPE = %(SOURCE_SUB_TYPE)s
-    ORDER BY QUERY_WINDOW_START_TIME ASC
     """
+    if stale_only:
+        query += _stale_candidate_predicate_sql()
+    if order:
+        query += "ORDER BY QUERY_WINDOW_START_TIME ASC\n"
+    if limit:
+        query += "LIMIT %(MAX_ROWS)s\n"
+    return query
+
+
+def _in_process_records_query(config: Dict[str, Any], max_rows: Optional[int] = None,
+                              server_sort: bool = True,
+                              columns: Optional[Iterable[str]] = None,
+                              stale_only: bool = False) -> tuple[str, Dict[str, Any]]:
+    """Builds the query and params that select IN_PROCESS records for this pipeline.
+       Rows are ordered by QUERY_WINDOW_START_TIME on the warehouse unless server_sort
+       is False; a max_rows cap always keeps the server-side ORDER BY so the earliest
+       windows are the ones returned. columns limits the projection (default: all).
+       stale_only keeps only the rows stale detection could flag (see
+       _stale_candidate_predicate_sql).
+      """
+    if max_rows is not None and (not isinstance(max_rows, int) or max_rows <= 0):
+        raise ValueError(f"max_rows must be a positive integer, got: {max_rows!r}")
+    
+    table_name = config["sf_drive_config"]["table"]
+    server_sort = server_sort or max_rows is not None
+    query = _in_process_records_sql(
+        table_name, None if columns is None else tuple(columns), server_sort, max_rows is not None, stale_only
+    )
 
-    # Build params directly in function - no need to separate
     params = {
         'PIPELINE_STATUS': 'IN_PROCESS',
         'PIPELINE_NAME': config['PIPELINE_NAME'],
@@ -227,26 +357,173 @@ def find_in_process_records(config: Dict[str, Any], logger: CustomLogger) -> Lis
         'SOURCE_CATEGORY': config['SOURCE_CATEGORY'],
         'SOURCE_SUB_TYPE': config['SOURCE_SUB_TYPE']
     }
-    print(f"DEBUG: Query : \n {query}")
-    print(f"DEBUG: Params : \n {params}")
-    print(f"DEBUG: Query and params built successfully")
+    
+    if max_rows is not None:
+        params['MAX_ROWS'] = max_rows
+    if stale_only:
+        params['DEFAULT_EXP_DURATION'] = config.get('PIPELINE_EXP_DURATION')
+        params['TZ'] = config.get('timezone', 'UTC')
+        params['STALE_FACTOR'] = config.get('stale_threshold_factor', 3)
+    return query, params
+
+
+def _stale_candidate_predicate_sql() -> str:
+    """
+    WHERE clause fragment that keeps only the IN_PROCESS rows stale detection could flag.
+
+    Uses the same offset-aware age as the reset MERGE: a row qualifies once it has run
+    for more than STALE_FACTOR times its expected duration. Rows whose start time or
+    duration does not parse are kept too, so stale detection can still report them
+    instead of silently skipping them.
+    """
+    expected_seconds = f"({_duration_seconds_sql(_EXP_DURATION_SQL)})"
+    return f"""AND (
+        {_pipeline_start_time_sql()} IS NULL
+        OR {expected_seconds} = 0
+        OR {_pipeline_elapsed_seconds_sql()} > {expected_seconds} * %(STALE_FACTOR)s
+    )
+    """
+
+
+def _row_factory(description, as_tuples: bool = False) -> Callable[[tuple], Union[Dict[str, Any], tuple]]:
+    """
+    Returns the function that turns a positional result row into a record.
+
+    The column names are read from the cursor description once per result set. Named
+    tuples carry no per-row key storage, so they are the lighter choice for callers that
+    only read a few fields; dicts are for callers that modify or re-insert records.
+    """
+    column_names = [column[0] for column in description]
+    if as_tuples:
+        return collections.namedtuple('DriveRecord', column_names, rename=True)._make
+    return lambda row: dict(zip(column_names, row))
+
+
+def _query_window_start_sort_key(record: Dict[str, Any]) -> tuple:
+    """Client-side equivalent of ORDER BY QUERY_WINDOW_START_TIME ASC (NULLs last)."""
+    start_time = record.get('QUERY_WINDOW_START_TIME')
+    return (start_time is None, start_time or '')
+
+
+def submit_in_process_records_query(config: Dict[str, Any], logger: CustomLogger, max_rows: Optional[int] = None,
+                                    columns: Optional[Iterable[str]] = None) -> str:
+    """Submits the IN_PROCESS records query without waiting for it and returns its query ID.
+       Do other work while Snowflake compiles and runs it, then pass the ID to
+       find_in_process_records / iter_in_process_records as query_id to collect the rows.
+      """
+    
+    validate_config_structure(config)
+    
+    sf_config = config["sf_drive_config"]
+    query, params = _in_process_records_query(config, max_rows, columns=columns)
     
     try:
         with get_snowflake_connection(sf_config, logger) as conn:
-            with conn.cursor(DictCursor) as cursor:
-                cursor.execute(query, params)
-                results = cursor.fetchall()
+            with conn.cursor() as cursor:
+                cursor.execute_async(query, params)
                 
-                print(f"DEBUG: Query executed successfully - records_found: {len(results)} | query_id: {cursor.sfqid}")
+                logger.info(
+                    f"Query submitted asynchronously with query_id: {cursor.sfqid}",
+                    keyword="QUERY_SUBMITTED",
+                    other_details={"query_id": cursor.sfqid}
+                )
+                
+                return cursor.sfqid
+            
+    except Exception as e:
+        logger.error(
+            f"Submitting IN_PROCESS records query failed: {str(e)}",
+            keyword="FIND_IN_PROCESS_RECORDS_FAILED",
+            other_details={
+                "exception_type": str(type(e)),
+                "exception_message": str(e),
+                "table_name": f"value: {sf_config['table']} ",
+                "query": query,
+                "params": params
+            }
+        )
+        raise
+
+
+def find_in_process_records(config: Dict[str, Any], logger: CustomLogger, query_id: Optional[str] = None,
+                            max_rows: Optional[int] = None,
+                            columns: Optional[Iterable[str]] = None,
+                            return_iterator: bool = False,
+                            stale_only: bool = False) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    """Finds all records with in_process status from drive table.
+       whose 
+       CONTINUITY_CHECK_PERFORMED = 'YES' 
+       and
+       CAN_FETCH_HISTORICAL_DATA = 'YES' 
+       are must
+       Pass the query_id returned by submit_in_process_records_query to collect the
+       results of an already submitted query instead of running it again.
+       max_rows caps the result to the earliest query windows; without it the whole
+       result is fetched anyway, so it is sorted here instead of on the warehouse.
+       columns selects only those columns (e.g. STALE_DETECTION_COLUMNS); by default
+       every column is returned. With query_id the submitted query's projection applies.
+       return_iterator=True streams the rows (sorted on the warehouse) instead of
+       building a list; see iter_in_process_records.
+       stale_only=True filters on the warehouse to the records that have run past
+       stale_threshold_factor times their expected duration (plus any whose times do
+       not parse), so stale detection does not download every in-process record.
+      """
+    if return_iterator:
+        return iter_in_process_records(config, logger, query_id, max_rows, True, columns, stale_only=stale_only)
+    
+    server_sort = max_rows is not None or query_id is not None
+    results = list(iter_in_process_records(
+        config, logger, query_id, max_rows, server_sort, columns, stale_only=stale_only
+    ))
+    if not server_sort:
+        results.sort(key=_query_window_start_sort_key)
+    return results
+
+
+def iter_in_process_records(config: Dict[str, Any], logger: CustomLogger, query_id: Optional[str] = None,
+                            max_rows: Optional[int] = None, server_sort: bool = True,
+                            columns: Optional[Iterable[str]] = None,
+                            as_tuples: bool = False,
+                            stale_only: bool = False) -> Iterator[Union[Dict[str, Any], tuple]]:
+    """Streaming form of find_in_process_records: yields matching rows as the cursor
+       downloads them instead of materialising the whole result set.
+       The pooled connection is held until the generator is exhausted or closed.
+       server_sort=False leaves the rows unordered for callers that sort themselves.
+       as_tuples=True yields read-only named tuples (row.PIPELINE_ID) instead of dicts.
+       The config and max_rows are validated when this is called, not on the first next().
+      """
+    
+    validate_config_structure(config)
+    
+    sf_config = config["sf_drive_config"]
+    query, params = _in_process_records_query(config, max_rows, server_sort, columns, stale_only)
+    return _stream_in_process_records(sf_config, logger, query, params, query_id, as_tuples)
+
+
+def _stream_in_process_records(sf_config: Dict[str, Any], logger: CustomLogger, query: str,
+                               params: Dict[str, Any], query_id: Optional[str],
+                               as_tuples: bool) -> Iterator[Union[Dict[str, Any], tuple]]:
+    """Generator body of iter_in_process_records; runs the already validated query."""
+    table_name = sf_config["table"]
+    
+    try:
+        with get_snowflake_connection(sf_config, logger) as conn:
+            # Plain positional cursor: the column names are read once and a dict is
+            # only built for rows the caller actually consumes
+            with conn.cursor() as cursor:
+                if query_id is None:
+                    cursor.execute(query, params)
+                else:
+                    # Waits for the previously submitted query and attaches its results
+                    cursor.get_results_from_sfqid(query_id)
                 
                 logger.info(
                     f"Query executed successfully with query_id: {cursor.sfqid}",
                     keyword="QUERY_EXECUTION_SUCCESS",
-                    other_details={"query_id": cursor.sfqid, "records_found": len(results)}
+                    other_details={"query_id": cursor.sfqid, "records_found": cursor.rowcount}
                 )
                 
-                print(f"DEBUG: find_in_process_records returning {len(results)} results")
-                return results
+                yield from map(_row_factory(cursor.description, as_tuples), cursor)
             
     except Exception as e:
         # CRITICAL ERROR - Log query execution details with actual values
@@ -260,117 +537,128 @@ def find_in_process_records(config: Dict[str, Any], logger: CustomLogger) -> Lis
                 "query": query,
                 # "params": {k: f"value: {v} | datatype: {type(v)}" for k, v in params.items()},
                 "params": params,
-                "sf_config_keys":  {k: ('******' if k == 'password' else f"value: {v}") for k, v in sf_config.items()}
+                "sf_config_keys": _redacted_sf_config(sf_config)
             }
         )
-        print(f"DEBUG: find_in_process_records failed - exception: {str(e)} | datatype: {type(e)}")
         raise
 
 
-def get_record_before_delete(conn, table_name: str, pipeline_id: str, logger: CustomLogger) -> Dict[str, Any]:
-    """Fetch and log the record before deletion for recovery purposes."""
-    print(f"DEBUG: get_record_before_delete() called")
-    print(f"DEBUG: table_name: {table_name}")
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    
-    select_query = f"SELECT * FROM {table_name} WHERE PIPELINE_ID = %(PIPELINE_ID)s"
-    select_params = {'PIPELINE_ID': pipeline_id}
+# Wording used when logging the pre-image of a record about to be deleted or updated
+_RECORD_CHANGE_ACTIONS = {
+    'DELETE': {'noun': 'deletion', 'past': 'DELETED'},
+    'UPDATE': {'noun': 'update', 'past': 'UPDATED'},
+}
+
+
+def _check_and_log_record_before_change(records: List[Dict[str, Any]], table_name: str, pipeline_id: str,
+                                        query_id: str, select_query: str, logger: CustomLogger,
+                                        operation: str = 'DELETE') -> Dict[str, Any]:
+    """
+    Verify exactly one record was fetched for PIPELINE_ID and log it for recovery purposes.
+
+    operation ('DELETE' or 'UPDATE') is the statement about to change the record; it
+    names the log keywords and messages.
+    """
+    action = _RECORD_CHANGE_ACTIONS[operation]
     
-    try:
-        with conn.cursor(DictCursor) as cursor:
-            cursor.execute(select_query, select_params)
-            records = cursor.fetchall()
-            
-            print(f"DEBUG: Records fetched - count: {len(records)} | query_id: {cursor.sfqid}")
-            
-            if len(records) == 0:
-                # CRITICAL ERROR - No record found
-                logger.error(
-                    f"No record found for deletion - PIPELINE_ID: {pipeline_id}",
-                    keyword="DELETE_RECORD_NOT_FOUND",
-                    other_details={
-                        "pipeline_id": pipeline_id,
-                        "table_name": table_name,
-                        "query_id": cursor.sfqid,
-                        "records_found": len(records),
-                        "select_query": f"SELECT * FROM {table_name} WHERE PIPELINE_ID = {pipeline_id}"
-                    }
-                )
-                error_msg = f"No record found with PIPELINE_ID: {pipeline_id} - cannot delete non-existent record"
-                # print(f"DEBUG: {error_msg}")
-                raise Exception(error_msg)
-                
-            elif len(records) > 1:
-                # CRITICAL ERROR - Data integrity issue
-                logger.error(
-                    f"Multiple records found for deletion - data integrity issue - PIPELINE_ID: {pipeline_id}",
-                    keyword="DELETE_MULTIPLE_RECORDS_FOUND",
-                    other_details={
-                        "pipeline_id": pipeline_id,
-                        "table_name": table_name,
-                        "query_id": cursor.sfqid,
-                        "records_found": len(records),
-                        "duplicate_records": records,
-                        "select_query": select_query
-                    }
-                )
-                error_msg = f"Multiple records found with PIPELINE_ID: {pipeline_id} - data integrity issue"
-                print(f"DEBUG: {error_msg}")
-                raise Exception(error_msg)
-            
-            record_to_delete = records[0]
-            print(f"DEBUG: Record found successfully - fields: {len(record_to_delete)}")
-            
-            # LOG THE COMPLETE RECORD FOR RECOVERY - THIS IS CRITICAL
-            logger.info(
-                f"RECORD ABOUT TO BE DELETED - PIPELINE_ID: {pipeline_id}",
-                keyword="RECORD_BEFORE_DELETE",
-                other_details={
-                    "PIPELINE_ID": pipeline_id,
-                    "table_name": table_name,
-                    "complete_record": record_to_delete,
-                    "query_id": cursor.sfqid,
-                    "record_field_count": len(record_to_delete)
-                }
-            )
-            
-            return record_to_delete
-            
-    except Exception as e:
-        # CRITICAL ERROR - Record fetch failed
+    if len(records) == 0:
+        # CRITICAL ERROR - No record found
         logger.error(
-            f"Failed to fetch record before deletion - PIPELINE_ID: {pipeline_id}: {str(e)}",
-            keyword="FETCH_BEFORE_DELETE_FAILED",
+            f"No record found for {action['noun']} - PIPELINE_ID: {pipeline_id}",
+            keyword=f"{operation}_RECORD_NOT_FOUND",
+            other_details={
+                "pipeline_id": pipeline_id,
+                "table_name": table_name,
+                "query_id": query_id,
+                "records_found": len(records),
+                "select_query": f"SELECT * FROM {table_name} WHERE PIPELINE_ID = {pipeline_id}"
+            }
+        )
+        error_msg = f"No record found with PIPELINE_ID: {pipeline_id} - cannot {operation.lower()} non-existent record"
+        raise Exception(error_msg)
+        
+    elif len(records) > 1:
+        # CRITICAL ERROR - Data integrity issue
+        logger.error(
+            f"Multiple records found for {action['noun']} - data integrity issue - PIPELINE_ID: {pipeline_id}",
+            keyword=f"{operation}_MULTIPLE_RECORDS_FOUND",
             other_details={
-                "exception_message": str(e),
                 "pipeline_id": pipeline_id,
                 "table_name": table_name,
+                "query_id": query_id,
+                "records_found": len(records),
+                "duplicate_records": records,
                 "select_query": select_query
             }
         )
-        print(f"DEBUG: get_record_before_delete failed - exception: {str(e)} | datatype: {type(e)}")
-        raise
+        error_msg = f"Multiple records found with PIPELINE_ID: {pipeline_id} - data integrity issue"
+        raise Exception(error_msg)
+    
+    record = records[0]
+    
+    # LOG THE COMPLETE RECORD FOR RECOVERY - THIS IS CRITICAL
+    logger.info(
+        f"RECORD ABOUT TO BE {action['past']} - PIPELINE_ID: {pipeline_id}",
+        keyword=f"RECORD_BEFORE_{operation}",
+        other_details={
+            "PIPELINE_ID": pipeline_id,
+            "table_name": table_name,
+            "complete_record": record,
+            "query_id": query_id,
+            "record_field_count": len(record)
+        }
+    )
+    
+    return record
+
+
+@functools.lru_cache(maxsize=32)
+def _select_by_pipeline_id_sql(table_name: str) -> str:
+    """Build (once per table) the SELECT of the row(s) with a given PIPELINE_ID."""
+    return f"SELECT * FROM {table_name} WHERE PIPELINE_ID = %(PIPELINE_ID)s"
+
+
+@functools.lru_cache(maxsize=32)
+def _delete_sql(table_name: str) -> str:
+    """
+    Build (once per table) the DELETE of one PIPELINE_ID.
+
+    The DELETE only removes the row when exactly one row has the PIPELINE_ID.
+    """
+    return (
+        f"DELETE FROM {table_name} WHERE PIPELINE_ID = %(PIPELINE_ID)s "
+        f"AND (SELECT COUNT(*) FROM {table_name} WHERE PIPELINE_ID = %(PIPELINE_ID)s) = 1"
+    )
 
 
 def execute_delete_query(conn, table_name: str, pipeline_id: str, logger: CustomLogger) -> str:
-    """Execute DELETE query and return query ID."""
-    print(f"DEBUG: execute_delete_query() called")
-    print(f"DEBUG: table_name: {table_name} ")
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    
-    # SAFETY: Get and log the record before deletion
-    record_to_delete = get_record_before_delete(conn, table_name, pipeline_id, logger)
+    """
+    Execute DELETE query and return query ID.
+
+    The audit SELECT and the DELETE go to Snowflake as one multi-statement request
+    (one round trip). The DELETE only removes the row when exactly one row has the
+    PIPELINE_ID, so a missing or duplicated record is reported without deleting anything.
+    """
     
-    delete_query = f"DELETE FROM {table_name} WHERE PIPELINE_ID = %(PIPELINE_ID)s"
+    select_query = _select_by_pipeline_id_sql(table_name)
+    delete_query = _delete_sql(table_name)
     delete_params = {'PIPELINE_ID': pipeline_id}
     
     try:
-        with conn.cursor() as cursor:
-            cursor.execute(delete_query, delete_params)
+        with conn.cursor(DictCursor) as cursor:
+            # SAFETY: Get the record before deletion in the same request
+            cursor.execute(f"{select_query};\n{delete_query};", delete_params, num_statements=2)
+            records = cursor.fetchall()
+            select_query_id = cursor.sfqid
+            
+            cursor.nextset()
             delete_rows_affected = cursor.rowcount
             delete_query_id = cursor.sfqid
             
-            print(f"DEBUG: DELETE executed - rows_affected: {delete_rows_affected} | query_id: {delete_query_id}")
+            # Log the record for recovery (raises if it was missing or duplicated)
+            _check_and_log_record_before_change(
+                records, table_name, pipeline_id, select_query_id, select_query, logger
+            )
             
             # Verify exactly one row was deleted
             if delete_rows_affected != 1:
@@ -388,7 +676,6 @@ def execute_delete_query(conn, table_name: str, pipeline_id: str, logger: Custom
                     }
                 )
                 error_msg = f"Expected to delete 1 row, but {delete_rows_affected} rows were affected for PIPELINE_ID: {pipeline_id}"
-                print(f"DEBUG: {error_msg}")
                 raise Exception(error_msg)
             
             logger.info(
@@ -411,59 +698,81 @@ def execute_delete_query(conn, table_name: str, pipeline_id: str, logger: Custom
                 "delete_query": delete_query
             }
         )
-        print(f"DEBUG: DELETE query failed - exception: {str(e)} | datatype: {type(e)}")
         raise
 
 
+@functools.lru_cache(maxsize=32)
+def _insert_sql(table_name: str, field_names: tuple) -> str:
+    """Build (once per table and field set) the INSERT statement with named placeholders."""
+    placeholders = [f"%({field})s" for field in field_names]
+    return f"INSERT INTO {table_name} ({', '.join(field_names)}) VALUES ({', '.join(placeholders)})"
+
+
 def execute_insert_query(conn, table_name: str, record_data: Dict[str, Any], logger: CustomLogger) -> str:
     """Execute INSERT query and return query ID."""
-    print(f"DEBUG: execute_insert_query() called")
-    print(f"DEBUG: table_name: {table_name}")
-    print(f"DEBUG: record_data_fields: {len(record_data)} | datatype: {type(record_data)}")
-    
-    field_names = list(record_data.keys())
-    pipeline_id = record_data.get('PIPELINE_ID', 'unknown')
-    
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    
-    placeholders = [f"%({field})s" for field in field_names]
-    insert_query = f"""
-    INSERT INTO {table_name} ({', '.join(field_names)})
-    VALUES ({', '.join(placeholders)})
+    return execute_bulk_insert(conn, table_name, [record_data], logger)
+
+
+def _common_field_names(records: List[Dict[str, Any]]) -> tuple:
     """
+    Return the sorted field names shared by every record, in one pass over the key views.
+    Sorted so that records with the same fields in a different order share one statement.
+    """
+    if not records:
+        raise ValueError("records cannot be empty")
     
-    insert_params = {field: record_data[field] for field in field_names}
+    field_set = records[0].keys()
+    for index, record in enumerate(records):
+        if record.keys() != field_set:
+            error_msg = f"Record {index} fields do not match the first record's fields - cannot bulk insert"
+            raise ValueError(error_msg)
+    return tuple(sorted(field_set))
+
+
+def _record_pipeline_ids(records: List[Dict[str, Any]]) -> List[str]:
+    """PIPELINE_IDs of the records, for error logs only."""
+    return [record.get('PIPELINE_ID', 'unknown') for record in records]
+
+
+def execute_bulk_insert(conn, table_name: str, records: List[Dict[str, Any]], logger: CustomLogger) -> str:
+    """
+    Execute one INSERT for many records with executemany and return query ID.
+
+    The statement is built once from the first record's fields and every record must
+    have the same fields, so the connector can send all rows as a single multi-row
+    INSERT. The row count check expects exactly len(records) rows to be inserted.
+    """
+    field_names = _common_field_names(records)
+    insert_query = _insert_sql(table_name, field_names)
     
     try:
         with conn.cursor() as cursor:
-            cursor.execute(insert_query, insert_params)
+            cursor.executemany(insert_query, records)
             insert_rows_affected = cursor.rowcount
             insert_query_id = cursor.sfqid
             
-            print(f"DEBUG: INSERT executed - rows_affected: {insert_rows_affected} | query_id: {insert_query_id}")
-            
-            # Verify exactly one row was inserted
-            if insert_rows_affected != 1:
+            # Verify exactly one row per record was inserted
+            if insert_rows_affected != len(records):
                 # CRITICAL ERROR - Unexpected row count
+                pipeline_ids = _record_pipeline_ids(records)
                 logger.error(
-                    f"INSERT operation affected unexpected number of rows - PIPELINE_ID: {pipeline_id}",
+                    f"INSERT operation affected unexpected number of rows - PIPELINE_IDs: {pipeline_ids}",
                     keyword="INSERT_UNEXPECTED_ROW_COUNT",
                     other_details={
-                        "expected_rows": 1,
+                        "expected_rows": len(records),
                         "actual_rows_affected": insert_rows_affected,
-                        "pipeline_id": f"value: {pipeline_id}",
+                        "pipeline_ids": pipeline_ids,
                         "table_name": f"value: {table_name} ",
                         "query_id": insert_query_id,
                         "insert_query": insert_query,
                         "field_names": field_names
                     }
                 )
-                error_msg = f"Expected to insert 1 row, but {insert_rows_affected} rows were affected for PIPELINE_ID: {pipeline_id}"
-                print(f"DEBUG: {error_msg}")
+                error_msg = f"Expected to insert {len(records)} rows, but {insert_rows_affected} rows were affected for PIPELINE_IDs: {pipeline_ids}"
                 raise Exception(error_msg)
             
             logger.info(
-                f"INSERT query executed successfully",
+                f"INSERT query executed successfully for {len(records)} records",
                 keyword="INSERT_RECORD_SUCCESS"
             )
             
@@ -471,28 +780,28 @@ def execute_insert_query(conn, table_name: str, record_data: Dict[str, Any], log
             
     except Exception as e:
         # CRITICAL ERROR - INSERT operation failed
+        pipeline_ids = _record_pipeline_ids(records)
         logger.error(
-            f"INSERT query execution failed - PIPELINE_ID: {pipeline_id}: {str(e)}",
+            f"INSERT query execution failed - PIPELINE_IDs: {pipeline_ids}: {str(e)}",
             keyword="INSERT_QUERY_FAILED",
             other_details={
                 "exception_type": str(type(e)),
                 "exception_message": str(e),
-                "pipeline_id": f"value: {pipeline_id}",
+                "pipeline_ids": pipeline_ids,
                 "table_name": f"value: {table_name} ",
                 "insert_query": insert_query,
                 "field_names": field_names,
-                "record_data_sample": {k: f"value: {v} | datatype: {type(v)}" for k, v in list(record_data.items())[:5]}  # First 5 fields only
+                # First 5 fields of the first record only, rendered only if the record is emitted
+                "record_data_sample": LazyDetail(
+                    lambda: {k: f"value: {v} | datatype: {type(v)}" for k, v in list(records[0].items())[:5]}
+                )
             }
         )
-        print(f"DEBUG: INSERT query failed - exception: {str(e)} | datatype: {type(e)}")
         raise
 
 
 def delete_single_record_from_snowflake(pipeline_id: str, config: Dict[str, Any], logger: CustomLogger) -> str:
     """Deletes a single record from Snowflake table."""
-    print(f"DEBUG: delete_single_record_from_snowflake() called")
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    # #  print(f"DEBUG: config: {type(config)}")
     
     validate_config_structure(config)
     validated_pipeline_id = validate_pipeline_id(pipeline_id)
@@ -502,25 +811,19 @@ def delete_single_record_from_snowflake(pipeline_id: str, config: Dict[str, Any]
     
     with get_snowflake_connection(sf_config, logger) as conn:
         result = execute_delete_query(conn, table_name, validated_pipeline_id, logger)
-        print(f"DEBUG: delete_single_record_from_snowflake completed successfully")
         return result
 
 
 def insert_single_record_to_snowflake(record_data: Dict[str, Any], config: Dict[str, Any], logger: CustomLogger) -> str:
     """Inserts a single record into Snowflake table."""
-    print(f"DEBUG: insert_single_record_to_snowflake() called")
-    print(f"""DEBUG: record_data: \n {record_data}""")
     
     validate_config_structure(config)
     
     if not record_data:
         error_msg = "record_data cannot be empty"
-        print(f"DEBUG: {error_msg}")
         raise ValueError(error_msg)
     
     pipeline_id = record_data.get('PIPELINE_ID')
-    print(f"DEBUG: inserting record \n {json.dumps(record_data, indent=4)}")
-    print(f"DEBUG: extracted_pipeline_id: {pipeline_id}")
     
     validate_pipeline_id(pipeline_id)
     
@@ -529,81 +832,327 @@ def insert_single_record_to_snowflake(record_data: Dict[str, Any], config: Dict[
     
     with get_snowflake_connection(sf_config, logger) as conn:
         result = execute_insert_query(conn, table_name, record_data, logger)
-        print(f"DEBUG: insert_single_record_to_snowflake completed successfully")
         return result
 
 
-def validate_record_pair(original_record: Dict[str, Any], updated_record: Dict[str, Any]) -> str:
-    """Validate that both records have matching PIPELINE_IDs and return validated ID."""
-    print(f"DEBUG: validate_record_pair() called")
-    print(f"DEBUG: original_record: {type(original_record)}")
-    
-    original_id = original_record.get('PIPELINE_ID')
-    updated_id = updated_record.get('PIPELINE_ID')
+def _csv_value(value: Any) -> Any:
+    """A record value as written to the COPY INTO CSV: NULL as \\N, dicts and lists as JSON."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (dict, list)):
+        # VARIANT columns such as MISCELLANEOUS_DATA; str() would give a Python repr
+        return json.dumps(value, default=str)
+    return value
 
-    print(f"DEBUG: original_id: {original_id}")
-    print(f"DEBUG: updated_id: {updated_id}")
 
-    validated_original = validate_pipeline_id(original_id)
-    validated_updated = validate_pipeline_id(updated_id)
+def bulk_insert_via_stage(conn, table_name: str, records: List[Dict[str, Any]], logger: CustomLogger) -> str:
+    """
+    Load many records with PUT + COPY INTO through the table stage and return the COPY query ID.
+
+    Records are written to a temporary CSV (None as \\N, so empty strings stay empty;
+    dicts and lists as JSON), uploaded to @%table with client-side compression, loaded
+    by column name order and purged from the stage. If the load fails, the staged file
+    is removed. Every record must have the same fields, and exactly len(records) rows
+    must be loaded.
+    """
+    field_names = _common_field_names(records)
     
-    if validated_original != validated_updated:
+    file_name = f"drive_bulk_{uuid.uuid4().hex}.csv"
+    copy_query = f"""
+    COPY INTO {table_name} ({', '.join(field_names)})
+    FROM @%{table_name}
+    FILES = ('{file_name}.gz')
+    FILE_FORMAT = (TYPE = CSV FIELD_OPTIONALLY_ENCLOSED_BY = '"' EMPTY_FIELD_AS_NULL = FALSE NULL_IF = ('\\\\N'))
+    PURGE = TRUE
+    """
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, file_name)
+            with open(file_path, 'w', newline='', encoding='utf-8') as csv_file:
+                writer = csv.writer(csv_file)
+                for record in records:
+                    writer.writerow([_csv_value(record[field]) for field in field_names])
+            
+            with conn.cursor(DictCursor) as cursor:
+                cursor.execute(f"PUT 'file://{file_path}' @%{table_name} AUTO_COMPRESS = TRUE PARALLEL = 4")
+                cursor.execute(copy_query)
+                copy_query_id = cursor.sfqid
+                rows_loaded = sum(row.get('rows_loaded') or 0 for row in cursor.fetchall())
+        
+        if rows_loaded != len(records):
+            # CRITICAL ERROR - Unexpected row count
+            logger.error(
+                f"COPY INTO loaded unexpected number of rows into {table_name}",
+                keyword="BULK_STAGE_UNEXPECTED_ROW_COUNT",
+                other_details={
+                    "expected_rows": len(records),
+                    "actual_rows_loaded": rows_loaded,
+                    "table_name": f"value: {table_name} ",
+                    "query_id": copy_query_id,
+                    "file_name": file_name
+                }
+            )
+            error_msg = f"Expected to load {len(records)} rows, but {rows_loaded} rows were loaded into {table_name}"
+            raise Exception(error_msg)
+        
+        logger.info(
+            f"COPY INTO loaded {rows_loaded} records successfully",
+            keyword="BULK_STAGE_INSERT_SUCCESS",
+            other_details={"query_id": copy_query_id, "table_name": f"value: {table_name} "}
+        )
+        return copy_query_id
+        
+    except Exception as e:
+        # CRITICAL ERROR - Staged load failed
+        logger.error(
+            f"Staged bulk insert failed for {table_name}: {str(e)}",
+            keyword="BULK_STAGE_INSERT_FAILED",
+            other_details={
+                "exception_type": str(type(e)),
+                "exception_message": str(e),
+                "table_name": f"value: {table_name} ",
+                "record_count": len(records),
+                "file_name": file_name,
+                "copy_query": copy_query
+            }
+        )
+        
+        # PURGE only runs when COPY succeeds; do not leave the file behind on the stage
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"REMOVE @%{table_name}/{file_name}.gz")
+        except Exception as remove_error:
+            logger.warning(
+                f"Could not remove staged file {file_name}.gz from @%{table_name}: {str(remove_error)}",
+                keyword="BULK_STAGE_REMOVE_FAILED",
+                other_details={"table_name": f"value: {table_name} ", "file_name": file_name}
+            )
+        raise
+
+
+def insert_records_to_snowflake(records: List[Dict[str, Any]], config: Dict[str, Any], logger: CustomLogger) -> str:
+    """Inserts many records into Snowflake table with a single INSERT, or with PUT + COPY INTO
+       when there are more than BULK_STAGE_THRESHOLD records."""
+    
+    validate_config_structure(config)
+    
+    if not records:
+        error_msg = "records cannot be empty"
+        raise ValueError(error_msg)
+    
+    for record_data in records:
+        validate_pipeline_id(record_data.get('PIPELINE_ID'))
+    
+    sf_config = config["sf_drive_config"]
+    table_name = sf_config["table"]
+    
+    with get_snowflake_connection(sf_config, logger) as conn:
+        if len(records) > BULK_STAGE_THRESHOLD:
+            result = bulk_insert_via_stage(conn, table_name, records, logger)
+        else:
+            result = execute_bulk_insert(conn, table_name, records, logger)
+        return result
+
+
+def validate_record_pair(original_record: Dict[str, Any], updated_record: Dict[str, Any]) -> str:
+    """Validate that both records have matching PIPELINE_IDs and return validated ID."""
+    
+    # Same dict (record modified in place): only one ID to validate
+    if original_record is updated_record:
+        return validate_pipeline_id(original_record.get('PIPELINE_ID'))
+    
+    original_id = original_record.get('PIPELINE_ID')
+    updated_id = updated_record.get('PIPELINE_ID')
+
+    # Identical raw IDs validate identically, so one validation covers both
+    if original_id == updated_id:
+        return validate_pipeline_id(original_id)
+
+    validated_original = validate_pipeline_id(original_id)
+    validated_updated = validate_pipeline_id(updated_id)
+    
+    if validated_original != validated_updated:
         # CRITICAL ERROR - Pipeline ID mismatch
         error_msg = f"PIPELINE_ID mismatch: original={validated_original}, updated={validated_updated}"
-        print(f"DEBUG: {error_msg}")
         raise ValueError(error_msg)
     
-    print(f"DEBUG: Record pair validation passed")
     return validated_original
 
 
-def execute_transaction(conn, table_name: str, pipeline_id: str, updated_record: Dict[str, Any], logger: CustomLogger) -> tuple[str, str]:
-    """Execute DELETE and INSERT in a transaction."""
-    print(f"DEBUG: execute_transaction() called")
-    print(f"DEBUG: table_name: {table_name}")
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    print(f"DEBUG: updated_record: {json.dumps(updated_record, indent=4)}")
+@functools.lru_cache(maxsize=32)
+def _update_sql(table_name: str, field_names: tuple) -> str:
+    """
+    Build (once per table and field set) the UPDATE of the given fields for one PIPELINE_ID.
+
+    The UPDATE only touches the row when exactly one row has the PIPELINE_ID, so a
+    missing or duplicated record leaves the table unchanged and shows up as a row
+    count other than 1.
+    """
+    set_clause = ', '.join(f"{field} = %({field})s" for field in field_names)
+    return (
+        f"UPDATE {table_name} SET {set_clause} WHERE PIPELINE_ID = %(PIPELINE_ID)s "
+        f"AND (SELECT COUNT(*) FROM {table_name} WHERE PIPELINE_ID = %(PIPELINE_ID)s) = 1"
+    )
+
+
+def _verify_update_row_count(rows_affected: int, table_name: str, pipeline_id: str, query_id: str,
+                             update_query: str, logger: CustomLogger) -> None:
+    """Raise (after logging) unless the UPDATE affected exactly one row."""
+    if rows_affected != 1:
+        # CRITICAL ERROR - Unexpected row count
+        logger.error(
+            f"UPDATE operation affected unexpected number of rows - PIPELINE_ID: {pipeline_id}",
+            keyword="UPDATE_UNEXPECTED_ROW_COUNT",
+            other_details={
+                "expected_rows": 1,
+                "actual_rows_affected": rows_affected,
+                "pipeline_id": f"value: {pipeline_id}",
+                "table_name": f"value: {table_name} ",
+                "query_id": query_id,
+                "update_query": update_query
+            }
+        )
+        error_msg = f"Expected to update 1 row, but {rows_affected} rows were affected for PIPELINE_ID: {pipeline_id}"
+        raise Exception(error_msg)
+
+
+def execute_update_query(conn, table_name: str, pipeline_id: str, changed_fields: Dict[str, Any], logger: CustomLogger) -> str:
+    """Execute UPDATE of the given fields for one PIPELINE_ID and return query ID."""
+    
+    field_names = tuple(changed_fields)
+    update_query = _update_sql(table_name, field_names)
     
-    # Start transaction
-    conn.autocommit = False
-    print(f"DEBUG: Transaction started (autocommit=False)")
+    # PIPELINE_ID is never part of the SET clause (validate_record_pair guarantees it is unchanged)
+    update_params = dict(changed_fields)
+    update_params['PIPELINE_ID'] = pipeline_id
     
     try:
-        # Execute DELETE
-        delete_query_id = execute_delete_query(conn, table_name, pipeline_id, logger)
-        print(f"DEBUG: DELETE completed in transaction")
+        with conn.cursor() as cursor:
+            cursor.execute(update_query, update_params)
+            update_rows_affected = cursor.rowcount
+            update_query_id = cursor.sfqid
+            
+            # Verify exactly one row was updated
+            _verify_update_row_count(update_rows_affected, table_name, pipeline_id, update_query_id, update_query, logger)
+            
+            # Runs once per record in batch conversions; callers log the batch summary
+            logger.debug(
+                f"UPDATE query executed successfully - PIPELINE_ID: {pipeline_id}",
+                keyword="UPDATE_RECORD_SUCCESS"
+            )
+            
+            return update_query_id
+            
+    except Exception as e:
+        # CRITICAL ERROR - UPDATE operation failed
+        logger.error(
+            f"UPDATE query execution failed - PIPELINE_ID: {pipeline_id}: {str(e)}",
+            keyword="UPDATE_QUERY_FAILED",
+            other_details={
+                "exception_type": str(type(e)),
+                "exception_message": str(e),
+                "pipeline_id": f"value: {pipeline_id}",
+                "table_name": f"value: {table_name} ",
+                "update_query": update_query,
+                "field_names": field_names
+            }
+        )
+        raise
+
+
+def execute_transaction(
+    conn,
+    table_name: str,
+    pipeline_id: str,
+    original_record: Dict[str, Any],
+    updated_record: Dict[str, Any],
+    logger: CustomLogger,
+    log_record_before_update: bool = False
+) -> Optional[str]:
+    """
+    Apply the difference between two versions of a record as a single UPDATE.
+
+    Only columns whose value changed are written; a column present in original_record
+    but missing from updated_record is set to NULL. Returns the UPDATE query ID, or None
+    when nothing changed and no statement was issued.
+
+    On its own the guarded UPDATE is atomic, so it runs under autocommit with no
+    explicit transaction. With log_record_before_update the current row is also fetched
+    and logged for recovery purposes; BEGIN, that SELECT, the UPDATE and COMMIT then go
+    to Snowflake as one multi-statement request, so the transaction still costs a
+    single round trip.
+    """
+    
+    changed_fields = {
+        field: value for field, value in updated_record.items()
+        if field != 'PIPELINE_ID' and original_record.get(field) != value
+    }
+    # A column dropped from updated_record is cleared, as the old DELETE + INSERT did
+    for field, value in original_record.items():
+        if field not in updated_record and value is not None:
+            changed_fields[field] = None
+    
+    if not changed_fields:
+        logger.info(
+            f"No changes to apply for PIPELINE_ID: {pipeline_id} - skipping UPDATE",
+            keyword="UPDATE_NO_CHANGES",
+            other_details={"pipeline_id": f"value: {pipeline_id}", "table_name": f"value: {table_name} "}
+        )
+        return None
+    
+    if not log_record_before_update:
+        return execute_update_query(conn, table_name, pipeline_id, changed_fields, logger)
+    
+    update_query_id = None
+    
+    select_query = _select_by_pipeline_id_sql(table_name)
+    update_query = _update_sql(table_name, tuple(changed_fields))
+    statements = ["BEGIN", select_query, update_query, "COMMIT"]
+    
+    # PIPELINE_ID is never part of the SET clause (validate_record_pair guarantees it is unchanged)
+    params = dict(changed_fields)
+    params['PIPELINE_ID'] = pipeline_id
+    
+    try:
+        with conn.cursor(DictCursor) as cursor:
+            cursor.execute(";\n".join(statements) + ";", params, num_statements=len(statements))
+            
+            # One (query_id, rowcount, rows) entry per statement, in order
+            statement_results = []
+            while True:
+                statement_results.append((cursor.sfqid, cursor.rowcount, cursor.fetchall()))
+                if cursor.nextset() is None:
+                    break
         
-        # Execute INSERT
-        insert_query_id = execute_insert_query(conn, table_name, updated_record, logger)
-        print(f"DEBUG: INSERT completed in transaction")
+        # SAFETY: Log the record as it was before being overwritten (raises if missing or duplicated)
+        select_query_id, _, records = statement_results[1]
+        _check_and_log_record_before_change(records, table_name, pipeline_id, select_query_id, select_query, logger,
+                                            operation='UPDATE')
         
-        # Commit transaction
-        conn.commit()
-        conn.autocommit = True
-        print(f"DEBUG: Transaction committed successfully")
+        # The guarded UPDATE wrote nothing unless exactly one row matched
+        update_query_id, update_rows_affected, _ = statement_results[-2]
+        _verify_update_row_count(update_rows_affected, table_name, pipeline_id, update_query_id, update_query, logger)
         
-        logger.info(
+        logger.debug(
             f"Transaction committed successfully for PIPELINE_ID: {pipeline_id}",
-            keyword="DELETE_INSERT_TRANSACTION_SUCCESS",
+            keyword="UPDATE_TRANSACTION_SUCCESS",
             other_details={
                         "pipeline_id": f"value: {pipeline_id}",
                         "table_name": f"value: {table_name} ",
-                        "delete_query_id": delete_query_id,
-                        "insert_query_id": insert_query_id,
-                        "updated_record" : json.dumps(updated_record, indent=4)
+                        "update_query_id": update_query_id,
+                        "changed_fields" : changed_fields
                     }
         )
         
-        return (delete_query_id, insert_query_id)
+        return update_query_id
         
     except Exception as e:
-        print(f"DEBUG: Transaction failed, attempting rollback")
-        print(f"DEBUG: transaction_exception: {str(e)} | datatype: {type(e)}")
         
+        # A statement that failed mid-request leaves the transaction open; after a
+        # successful COMMIT this is a no-op
         try:
             conn.rollback()
-            conn.autocommit = True
-            print(f"DEBUG: Transaction rolled back successfully")
         except Exception as rollback_error:
             # CRITICAL ERROR - Rollback failed
             logger.error(
@@ -614,12 +1163,10 @@ def execute_transaction(conn, table_name: str, pipeline_id: str, updated_record:
                     "rollback_exception": f"value: {str(rollback_error)}",
                     "pipeline_id": f"value: {pipeline_id}",
                     "table_name": f"value: {table_name} ",
-                    "delete_query_id": delete_query_id,
-                    "insert_query_id": insert_query_id,
-                    "updated_record" : json.dumps(updated_record, indent=4)
+                    "update_query_id": update_query_id,
+                    "changed_fields" : changed_fields
                 }
             )
-            print(f"DEBUG: Rollback failed - exception: {str(rollback_error)} | datatype: {type(rollback_error)}")
         
         raise
 
@@ -630,11 +1177,13 @@ def delete_old_in_process_record_and_insert_new_pending_record(
     config: Dict[str, Any], 
     logger: CustomLogger
 ) -> None:
-    """Deletes an old in-process record and inserts a new pending record in a transaction."""
-    print(f"DEBUG: delete_old_in_process_record_and_insert_new_pending_record() called")
-    print(f"DEBUG: original_stale_record: {json.dumps(original_stale_record, indent=4)} \n")
-    print(f"DEBUG: updated_stale_record: {json.dumps(updated_stale_record, indent=4)} \n")
-    # print(f"DEBUG: config: {json.dumps(config, indent=4)}")
+    """
+    Replaces an old in-process record with its new pending version in a transaction.
+
+    Despite the historical name, this issues a single UPDATE of the changed columns
+    rather than a DELETE followed by an INSERT. Set config['log_record_before_update']
+    to fetch and log the current row before it is overwritten.
+    """
 
     validate_config_structure(config)
     pipeline_id = validate_record_pair(original_stale_record, updated_stale_record)
@@ -644,22 +1193,288 @@ def delete_old_in_process_record_and_insert_new_pending_record(
     
     try:
         with get_snowflake_connection(sf_config, logger) as conn:
-            delete_query_id, insert_query_id = execute_transaction(
-                conn, table_name, pipeline_id, updated_stale_record, logger
+            execute_transaction(
+                conn, table_name, pipeline_id, original_stale_record, updated_stale_record, logger,
+                log_record_before_update=config.get('log_record_before_update', False)
             )
-            print(f"DEBUG: Transaction completed successfully")
             
     except Exception as e:
         # CRITICAL ERROR - Transaction operation failed
         logger.error(
-            f"DELETE and INSERT operation failed for PIPELINE_ID: {pipeline_id}: {str(e)}",
-            keyword="DELETE_INSERT_RECORD_FAILED",
+            f"UPDATE operation failed for PIPELINE_ID: {pipeline_id}: {str(e)}",
+            keyword="UPDATE_RECORD_FAILED",
             other_details={
                 "exception_message": str(e),
                 "pipeline_id": f"value: {pipeline_id}",
                 "table_name": f"value: {table_name}",
-                "original_record_fields": json.dumps(original_stale_record, indent=4),
-                "updated_record_fields": json.dumps(updated_stale_record, indent=4)
+                "original_record_fields": original_stale_record,
+                "updated_record_fields": updated_stale_record
+            }
+        )
+        raise
+
+
+def bulk_update_stale_records(
+    original_records: List[Dict[str, Any]],
+    updated_records: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    logger: CustomLogger
+) -> int:
+    """
+    Applies many record updates with a single MERGE instead of one UPDATE round trip per record.
+
+    original_records[i] and updated_records[i] must describe the same PIPELINE_ID. Only
+    columns that changed in at least one record are written. Like the single-record
+    UPDATE, the MERGE only writes when every PIPELINE_ID matches exactly one row, so it
+    runs as one autocommitted statement and a partial batch is never applied.
+
+    Returns:
+        int: Number of rows updated (0 when nothing changed).
+    """
+    
+    if len(original_records) != len(updated_records):
+        error_msg = f"Record count mismatch: original={len(original_records)}, updated={len(updated_records)}"
+        raise ValueError(error_msg)
+    
+    validate_config_structure(config)
+    pipeline_ids = [
+        validate_record_pair(original, updated)
+        for original, updated in zip(original_records, updated_records)
+    ]
+    if len(set(pipeline_ids)) != len(pipeline_ids):
+        error_msg = "Duplicate PIPELINE_IDs in bulk update - each record must be updated at most once"
+        raise ValueError(error_msg)
+    
+    # Every row of the VALUES list needs the same columns, so write the union of changed columns
+    changed_columns: List[str] = []
+    for original, updated in zip(original_records, updated_records):
+        for field, value in updated.items():
+            if field != 'PIPELINE_ID' and field not in changed_columns and original.get(field) != value:
+                changed_columns.append(field)
+    
+    if not changed_columns:
+        logger.info(
+            "No changes to apply in bulk update - skipping MERGE",
+            keyword="BULK_UPDATE_NO_CHANGES",
+            other_details={"record_count": len(updated_records)}
+        )
+        return 0
+    
+    sf_config = config["sf_drive_config"]
+    table_name = sf_config["table"]
+    
+    columns = ['PIPELINE_ID'] + changed_columns
+    rows = []
+    params: Dict[str, Any] = {}
+    for index, (pipeline_id, updated) in enumerate(zip(pipeline_ids, updated_records)):
+        params[f"PIPELINE_ID_{index}"] = pipeline_id
+        for column in changed_columns:
+            params[f"{column}_{index}"] = updated.get(column)
+        rows.append("(" + ", ".join(f"%({column}_{index})s" for column in columns) + ")")
+    
+    source_columns = ", ".join(f"${position} AS {column}" for position, column in enumerate(columns, 1))
+    value_columns = ", ".join(f"v.{column}" for column in columns)
+    set_clause = ", ".join(f"t.{column} = s.{column}" for column in changed_columns)
+    # The source keeps its rows only when every PIPELINE_ID matches exactly one target
+    # row (no duplicate matches, none missing); otherwise it is empty and nothing is written
+    merge_query = f"""
+    MERGE INTO {table_name} t
+    USING (
+        SELECT {', '.join(columns)} FROM (
+            SELECT {value_columns}, COUNT(*) OVER (PARTITION BY v.PIPELINE_ID) AS MATCH_COUNT
+            FROM (SELECT {source_columns} FROM VALUES {', '.join(rows)}) v
+            JOIN {table_name} d ON d.PIPELINE_ID = v.PIPELINE_ID
+        )
+        QUALIFY MAX(MATCH_COUNT) OVER () = 1 AND COUNT(*) OVER () = {len(pipeline_ids)}
+    ) s
+    ON t.PIPELINE_ID = s.PIPELINE_ID
+    WHEN MATCHED THEN UPDATE SET {set_clause}
+    """
+    
+    try:
+        with get_snowflake_connection(sf_config, logger) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(merge_query, params)
+                rows_updated = cursor.rowcount
+                merge_query_id = cursor.sfqid
+        
+        # The guarded MERGE wrote nothing unless every PIPELINE_ID matched exactly one row
+        if rows_updated != len(pipeline_ids):
+            error_msg = f"Expected to update {len(pipeline_ids)} rows, but {rows_updated} rows were affected"
+            raise Exception(error_msg)
+        
+        logger.info(
+            f"Bulk update applied successfully for {rows_updated} records",
+            keyword="BULK_UPDATE_SUCCESS",
+            other_details={
+                "table_name": f"value: {table_name} ",
+                "query_id": merge_query_id,
+                "rows_updated": rows_updated,
+                "changed_columns": changed_columns
+            }
+        )
+        return rows_updated
+        
+    except Exception as e:
+        # CRITICAL ERROR - Bulk update failed, nothing was committed
+        logger.error(
+            f"Bulk update failed: {str(e)}",
+            keyword="BULK_UPDATE_FAILED",
+            other_details={
+                "exception_message": str(e),
+                "table_name": f"value: {table_name}",
+                "pipeline_ids": pipeline_ids,
+                "changed_columns": changed_columns
+            }
+        )
+        raise
+
+
+# Phases reset by stale-record recovery; each has _STATUS, _START_TS, _END_TS and
+# _DURATION columns. A phase whose status is COMPLETED is left as it is.
+STALE_RESET_PHASES = ('SRC_STG_XFER', 'SRC_STG_AUDIT', 'STG_TGT_XFER', 'STG_TGT_AUDIT', 'SRC_TGT_AUDIT')
+
+
+# A record's own PIPELINE_EXP_DURATION, falling back to the config default
+_EXP_DURATION_SQL = "COALESCE(NULLIF(PIPELINE_EXP_DURATION, ''), %(DEFAULT_EXP_DURATION)s)"
+
+
+def _duration_seconds_sql(column: str) -> str:
+    """SQL equivalent of parse_duration_string_to_seconds for a duration string column."""
+    return " + ".join(
+        f"COALESCE(REGEXP_SUBSTR({column}, '([0-9]+){unit}', 1, 1, 'e', 1)::INT, 0) * {factor}"
+        for unit, factor in _UNIT_SECONDS.items()
+    )
+
+
+def _pipeline_start_time_sql() -> str:
+    """
+    PIPELINE_START_TIME as a UTC TIMESTAMP_NTZ, NULL when it does not parse.
+
+    A start time that carries its own offset keeps it; one without an offset is read as
+    wall-clock time in %(TZ)s, the same way _as_aware_datetime does in Python.
+    """
+    return (
+        "IFF(REGEXP_LIKE(PIPELINE_START_TIME, '.*([Zz]|[+-][0-9]{2}:?[0-9]{2})'), "
+        "CONVERT_TIMEZONE('UTC', TRY_TO_TIMESTAMP_TZ(PIPELINE_START_TIME))::TIMESTAMP_NTZ, "
+        "CONVERT_TIMEZONE(%(TZ)s, 'UTC', TRY_TO_TIMESTAMP_NTZ(PIPELINE_START_TIME)))"
+    )
+
+
+def _pipeline_elapsed_seconds_sql() -> str:
+    """Seconds a record has been running, measured offset-aware against CURRENT_TIMESTAMP()."""
+    return (
+        f"DATEDIFF(second, {_pipeline_start_time_sql()}, "
+        "CONVERT_TIMEZONE('UTC', CURRENT_TIMESTAMP())::TIMESTAMP_NTZ)"
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _reset_stale_records_sql(table_name: str) -> str:
+    """Build (once per table) the MERGE that turns stale IN_PROCESS records back into PENDING ones."""
+    phase_resets = []
+    for phase in STALE_RESET_PHASES:
+        completed = f"t.{phase}_STATUS = 'COMPLETED'"
+        phase_resets.append(f"{phase}_STATUS = IFF({completed}, t.{phase}_STATUS, 'PENDING')")
+        for suffix in ('START_TS', 'END_TS', 'DURATION'):
+            phase_resets.append(f"{phase}_{suffix} = IFF({completed}, t.{phase}_{suffix}, NULL)")
+    set_clause = ",\n            ".join([
+        "PIPELINE_STATUS = 'PENDING'",
+        "PIPELINE_START_TIME = NULL",
+        "PIPELINE_END_TIME = NULL",
+        "PIPELINE_DURATION = NULL",
+        *phase_resets,
+        "RETRY_ATTEMPT_NUMBER = COALESCE(t.RETRY_ATTEMPT_NUMBER, 0) + 1"
+    ])
+    expected_seconds = _duration_seconds_sql(_EXP_DURATION_SQL)
+    return f"""
+    MERGE INTO {table_name} t
+    USING (
+        SELECT c.PIPELINE_ID, c.EXPECTED_SECONDS, c.ACTUAL_SECONDS
+        FROM (
+            SELECT PIPELINE_ID,
+                {expected_seconds} AS EXPECTED_SECONDS,
+                {_pipeline_elapsed_seconds_sql()} AS ACTUAL_SECONDS
+            FROM {table_name}
+            WHERE 
+            PIPELINE_STATUS = 'IN_PROCESS'
+            AND CONTINUITY_CHECK_PERFORMED = 'YES' 
+            AND CAN_FETCH_HISTORICAL_DATA = 'YES' 
+            AND PIPELINE_NAME = %(PIPELINE_NAME)s
+            AND SOURCE_NAME = %(SOURCE_NAME)s
+            AND SOURCE_CATEGORY = %(SOURCE_CATEGORY)s 
+            AND SOURCE_SUB_TYPE = %(SOURCE_SUB_TYPE)s
+        ) c
+        -- Joined back to every row with the PIPELINE_ID, whatever its status or pipeline:
+        -- a duplicated PIPELINE_ID is a data integrity issue; leave it for manual review
+        JOIN {table_name} d ON d.PIPELINE_ID = c.PIPELINE_ID
+        QUALIFY COUNT(*) OVER (PARTITION BY c.PIPELINE_ID) = 1
+    ) s
+    ON t.PIPELINE_ID = s.PIPELINE_ID
+    WHEN MATCHED AND s.EXPECTED_SECONDS > 0 AND s.ACTUAL_SECONDS > s.EXPECTED_SECONDS * %(STALE_FACTOR)s THEN UPDATE SET
+            {set_clause}
+    """
+
+
+def reset_stale_in_process_records(config: Dict[str, Any], logger: CustomLogger) -> int:
+    """
+    Turns every stale IN_PROCESS record of this pipeline back into a PENDING one with a
+    single server-side MERGE, without fetching the records.
+
+    A record is stale when it has been running for more than stale_threshold_factor
+    (default 3) times its PIPELINE_EXP_DURATION (falling back to
+    config['PIPELINE_EXP_DURATION']). The reset matches stale detection's
+    mark_record_as_pending: pipeline status and timing are cleared, every phase that is
+    not COMPLETED goes back to PENDING, and RETRY_ATTEMPT_NUMBER is incremented.
+
+    Use this when the stale records themselves are not needed (no per-record alert);
+    detect_and_handle_stale_records still fetches them so it can alert on them.
+
+    Returns:
+        int: Number of records reset.
+    """
+
+    validate_config_structure(config)
+
+    sf_config = config["sf_drive_config"]
+    table_name = sf_config["table"]
+    merge_query = _reset_stale_records_sql(table_name)
+    params = {
+        'PIPELINE_NAME': config['PIPELINE_NAME'],
+        'SOURCE_NAME': config['SOURCE_NAME'],
+        'SOURCE_CATEGORY': config['SOURCE_CATEGORY'],
+        'SOURCE_SUB_TYPE': config['SOURCE_SUB_TYPE'],
+        'DEFAULT_EXP_DURATION': config.get('PIPELINE_EXP_DURATION'),
+        'TZ': config.get('timezone', 'UTC'),
+        'STALE_FACTOR': config.get('stale_threshold_factor', 3)
+    }
+
+    try:
+        with get_snowflake_connection(sf_config, logger) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(merge_query, params)
+                rows_updated = cursor.rowcount
+
+                logger.info(
+                    f"Reset {rows_updated} stale records to PENDING",
+                    keyword="RESET_STALE_RECORDS_SUCCESS",
+                    other_details={
+                        "table_name": f"value: {table_name} ",
+                        "query_id": cursor.sfqid,
+                        "rows_updated": rows_updated
+                    }
+                )
+                return rows_updated
+
+    except Exception as e:
+        logger.error(
+            f"Resetting stale records failed: {str(e)}",
+            keyword="RESET_STALE_RECORDS_FAILED",
+            other_details={
+                "exception_type": type(e).__name__,
+                "exception_message": str(e),
+                "table_name": f"value: {table_name}",
+                "params": params
             }
         )
         raise
@@ -680,17 +1495,11 @@ def update_in_process_single_record_to_pending_record(stale_record: Dict[str, An
     Raises:
         Exception: If database update fails
     """
-    print(f"DEBUG: update_in_process_single_record_to_pending_record() called")
-    print(f"DEBUG: stale_record: {type(stale_record)} | config: {type(config)}")
     
     pipeline_id = stale_record.get('PIPELINE_ID', 'unknown')
     pipeline_status = stale_record.get('PIPELINE_STATUS')
     retry_attempt = stale_record.get('RETRY_ATTEMPT_NUMBER')
     
-    print(f"DEBUG: pipeline_id: {pipeline_id}")
-    print(f"DEBUG: pipeline_status: {pipeline_status} | datatype: {type(pipeline_status)}")
-    print(f"DEBUG: retry_attempt: {retry_attempt} | datatype: {type(retry_attempt)}")
-    
     # TODO: Implement actual database update logic
     # This will build the UPDATE SQL statement and execute it
     # Using PIPELINE_ID as the WHERE clause identifier
@@ -705,7 +1514,6 @@ def update_in_process_single_record_to_pending_record(stale_record: Dict[str, An
         }
     )
     
-    print(f"DEBUG: update_in_process_single_record_to_pending_record completed")
     pass
 
 
@@ -725,96 +1533,71 @@ def parse_duration_string_to_seconds(duration_string: str) -> int:
     Raises:
         ValueError: If no valid duration units are found.
     """
-    print(f"DEBUG: parse_duration_string_to_seconds() called with: {duration_string}")
 
     if not isinstance(duration_string, str):
         raise ValueError(f"Invalid type for duration string: {type(duration_string)}. Expected str.")
 
-    total_seconds = 0
-    valid_unit_found = False
+    seconds = _COMMON_DURATIONS.get(duration_string)
+    if seconds is not None:
+        return seconds
+    return _duration_string_seconds(duration_string)
 
-    pattern_map = {
-        'd': 86400,
-        'h': 3600,
-        'm': 60,
-        's': 1
-    }
-
-    try:
-        for unit, multiplier in pattern_map.items():
-            match = re.search(fr"(\d+){unit}", duration_string)
-            if match:
-                value = int(match.group(1))
-                seconds = value * multiplier
-                total_seconds += seconds
-                valid_unit_found = True
-                print(f"  Parsed {value}{unit} → {seconds} seconds")
 
-        if not valid_unit_found:
-            raise ValueError(f"No valid time units (d/h/m/s) found in string: '{duration_string}'")
+# Configs reuse a handful of strings ('1h', '15m', ...); the type check above stays
+# outside the cache so unhashable input still raises ValueError rather than TypeError
+@functools.lru_cache(maxsize=32)
+def _duration_string_seconds(duration_string: str) -> int:
+    # Single pass over the string; only the first amount given for each unit counts
+    unit_values: Dict[str, int] = {}
+    for amount, unit in _DURATION_RE.findall(duration_string):
+        unit_values.setdefault(unit, int(amount))
 
-        print(f"DEBUG: Total seconds parsed = {total_seconds}")
-        return total_seconds
+    if not unit_values:
+        raise ValueError(f"No valid time units (d/h/m/s) found in string: '{duration_string}'")
 
-    except Exception as e:
-        print(f"ERROR: Failed to parse duration string: '{duration_string}' | Exception: {str(e)}")
-        raise
+    return sum(value * _UNIT_SECONDS[unit] for unit, value in unit_values.items())
 
 
-def get_valid_pending_records(config: Dict[str, Any], logger: CustomLogger) -> List[Dict[str, Any]]:
+def precompute_duration_settings(config: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Fetches valid PENDING records based on QUERY_WINDOW time constraints.
-
-    Criteria:
-    - PIPELINE_STATUS = 'PENDING'
-    - CONTINUITY_CHECK_PERFORMED = 'YES'
-    - CAN_FETCH_HISTORICAL_DATA = 'YES'
-    - QUERY_WINDOW_START_TIME and END_TIME <= MAX_ACCEPTED_TIME
+    Parses the config's duration strings once and stores the results in the config.
 
-    MAX_ACCEPTED_TIME = now(timezone) - (x_time_back + granularity)
+    Call after loading the config; get_valid_pending_records then reads the stored
+    seconds instead of parsing 'x_time_back' and 'granularity' on every call.
 
     Args:
-        config (Dict[str, Any]): Configuration dictionary
-        logger (CustomLogger): Logger for critical events
+        config (Dict[str, Any]): Configuration dictionary, updated in place
 
     Returns:
-        List[Dict[str, Any]]: List of valid PENDING records
+        Dict[str, Any]: The same config, for chaining
     """
+    config['_x_time_back_seconds'] = parse_duration_string_to_seconds(config["x_time_back"])
+    config['_granularity_seconds'] = parse_duration_string_to_seconds(config["granularity"])
+    return config
 
-    print("DEBUG: get_valid_pending_records() called")
-    print(f"DEBUG: config keys = {list(config.keys())}")
 
-    # Extract and validate critical config values
-    try:
-        timezone_str = config.get("timezone", "UTC")
-        tz = pytz.timezone(timezone_str)
-        print(f"DEBUG: timezone set to {timezone_str}")
-    except Exception as e:
-        print(f"ERROR: Invalid timezone in config: {str(e)}")
-        raise
-
-    try:
-        x_time_back_str = config["x_time_back"]
-        granularity_str = config["granularity"]
-        print(f"DEBUG: x_time_back = {x_time_back_str}, granularity = {granularity_str}")
-
-        x_time_back_seconds = parse_duration_string_to_seconds(x_time_back_str)
-        granularity_seconds = parse_duration_string_to_seconds(granularity_str)
+def _pending_window_offset_seconds(config: Dict[str, Any]) -> int:
+    """x_time_back + granularity in seconds, using the precomputed values when present."""
+    x_time_back_seconds = config.get('_x_time_back_seconds')
+    if x_time_back_seconds is None:
+        x_time_back_seconds = parse_duration_string_to_seconds(config["x_time_back"])
+    granularity_seconds = config.get('_granularity_seconds')
+    if granularity_seconds is None:
+        granularity_seconds = parse_duration_string_to_seconds(config["granularity"])
+    return x_time_back_seconds + granularity_seconds
 
-        total_offset_seconds = x_time_back_seconds + granularity_seconds
-        now = datetime.now(tz)
-        max_accepted_time = now - timedelta(seconds=total_offset_seconds)
-        print(f"DEBUG: MAX_ACCEPTED_TIME = {max_accepted_time.isoformat()}")
 
-    except Exception as e:
-        print(f"ERROR: Failed to calculate MAX_ACCEPTED_TIME: {str(e)}")
-        raise
+@functools.lru_cache(maxsize=32)
+def _valid_pending_records_sql(table_name: str, columns: Optional[tuple]) -> str:
+    """
+    Build (once per table and shape) the valid PENDING records query text.
 
-    # Prepare SQL
-    table_name = config["sf_drive_config"]["table"]
-    max_pending_records = config["max_pending_records"]
+    QUERY_WINDOW_START_TIME is a VARCHAR, so it is parsed explicitly with
+    TRY_TO_TIMESTAMP_TZ: a value that does not parse leaves that row out instead of
+    failing the whole fetch.
+    """
     query = f"""
-    SELECT * FROM {table_name}
+    SELECT {_select_list(columns)} FROM {table_name}
     WHERE 
         PIPELINE_STATUS = %(PIPELINE_STATUS)s 
         AND CONTINUITY_CHECK_PERFORMED = 'YES' 
@@ -823,11 +1606,27 @@ def get_valid_pending_records(config: Dict[str, Any], logger: CustomLogger) -> L
         AND SOURCE_NAME = %(SOURCE_NAME)s
         AND SOURCE_CATEGORY = %(SOURCE_CATEGORY)s 
         AND SOURCE_SUB_TYPE = %(SOURCE_SUB_TYPE)s
-        AND QUERY_WINDOW_START_TIME <= %(MAX_ACCEPTED_TIME)s
+        AND TRY_TO_TIMESTAMP_TZ(QUERY_WINDOW_START_TIME) <= DATEADD(second, -%(OFFSET_SECONDS)s, CONVERT_TIMEZONE(%(TZ)s, CURRENT_TIMESTAMP()))
     ORDER BY QUERY_WINDOW_START_TIME ASC
-    LIMIT {max_pending_records}
+    LIMIT %(LIMIT_N)s
     """
-    # AND QUERY_WINDOW_END_TIME <= %(MAX_ACCEPTED_TIME)s
+    # AND TRY_TO_TIMESTAMP_TZ(QUERY_WINDOW_END_TIME) <= DATEADD(second, -%(OFFSET_SECONDS)s, CONVERT_TIMEZONE(%(TZ)s, CURRENT_TIMESTAMP()))
+    return query
+
+
+def _valid_pending_records_query(config: Dict[str, Any],
+                                 columns: Optional[Iterable[str]] = None) -> tuple[str, Dict[str, Any]]:
+    """Builds the query and params that select valid PENDING records for this pipeline."""
+
+    # The cutoff itself is computed by Snowflake (see _valid_pending_records_sql), so only the
+    # offset is worked out here
+    timezone_str = config.get("timezone", "UTC")
+    total_offset_seconds = _pending_window_offset_seconds(config)
+
+    # Prepare SQL
+    query = _valid_pending_records_sql(
+        config["sf_drive_config"]["table"], None if columns is None else tuple(columns)
+    )
 
     params = {
         'PIPELINE_STATUS': 'PENDING',
@@ -835,29 +1634,62 @@ def get_valid_pending_records(config: Dict[str, Any], logger: CustomLogger) -> L
         'SOURCE_NAME': config['SOURCE_NAME'],
         'SOURCE_CATEGORY': config['SOURCE_CATEGORY'],
         'SOURCE_SUB_TYPE': config['SOURCE_SUB_TYPE'],
-        'MAX_ACCEPTED_TIME': max_accepted_time
+        'OFFSET_SECONDS': total_offset_seconds,
+        'TZ': timezone_str,
+        'LIMIT_N': int(config["max_pending_records"])
     }
+    return query, params
 
-    print("DEBUG: SQL and params ready. Executing query...")
 
-    print("\nQuery Parameters:")
-    for k, v in params.items():
-        print(f"  {k} = {v}  (type: {type(v)})")
+def get_valid_pending_records(config: Dict[str, Any], logger: CustomLogger,
+                              columns: Optional[Iterable[str]] = None,
+                              return_iterator: bool = False) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    """
+    Fetches valid PENDING records based on QUERY_WINDOW time constraints.
 
-    print("\nFormatted SQL for manual testing:")
-    formatted_query = query
-    for key, val in params.items():
-        raw_val = f"'{val}'" if isinstance(val, str) else f"TO_TIMESTAMP('{val.isoformat()}')" if isinstance(val, datetime) else str(val)
-        formatted_query = formatted_query.replace(f"%({key})s", raw_val)
-    print(formatted_query)
+    Criteria:
+    - PIPELINE_STATUS = 'PENDING'
+    - CONTINUITY_CHECK_PERFORMED = 'YES'
+    - CAN_FETCH_HISTORICAL_DATA = 'YES'
+    - QUERY_WINDOW_START_TIME and END_TIME <= MAX_ACCEPTED_TIME
+
+    MAX_ACCEPTED_TIME = now(timezone) - (x_time_back + granularity), evaluated by
+    Snowflake; rows whose QUERY_WINDOW_START_TIME does not parse are skipped
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary
+        logger (CustomLogger): Logger for critical events
+        columns (Iterable[str] | None): Columns to fetch. Defaults to every column.
+        return_iterator (bool): Stream the rows instead of building a list; see
+                                iter_valid_pending_records.
+
+    Returns:
+        List[Dict[str, Any]] | Iterator[Dict[str, Any]]: Valid PENDING records
+    """
+
+    if return_iterator:
+        return iter_valid_pending_records(config, logger, columns)
+
+    query, params = _valid_pending_records_query(config, columns)
+    table_name = config["sf_drive_config"]["table"]
+
+    if logger.isEnabledFor(logging.DEBUG):
+        # Only build the manually runnable SQL when it will actually be logged
+        formatted_query = _PLACEHOLDER_RE.sub(lambda match: _sql_literal(params[match.group(1)]), query)
+        logger.debug(
+            "Executing valid PENDING records query",
+            keyword="FETCH_VALID_PENDING_QUERY",
+            other_details={"formatted_query": formatted_query}
+        )
 
     try:
         with get_snowflake_connection(config["sf_drive_config"], logger) as conn:
-            with conn.cursor(DictCursor) as cursor:
+            # Positional rows are mapped to dicts here, which skips DictCursor's
+            # per-row dict building inside the connector
+            with conn.cursor() as cursor:
                 cursor.execute(query, params)
-                results = cursor.fetchall()
+                results = list(map(_row_factory(cursor.description), cursor.fetchall()))
 
-                print(f"DEBUG: Query executed. Records found = {len(results)} | Query ID: {cursor.sfqid}")
                 logger.info(
                     "Fetched valid PENDING records successfully",
                     keyword="FETCH_VALID_PENDING_SUCCESS",
@@ -869,7 +1701,6 @@ def get_valid_pending_records(config: Dict[str, Any], logger: CustomLogger) -> L
                 return results
 
     except Exception as e:
-        print(f"ERROR: Failed to fetch valid pending records: {str(e)}")
         logger.error(
             "Exception while fetching valid pending records",
             keyword="FETCH_VALID_PENDING_FAILED",
@@ -882,12 +1713,111 @@ def get_valid_pending_records(config: Dict[str, Any], logger: CustomLogger) -> L
         raise
 
 
+def iter_valid_pending_records(config: Dict[str, Any], logger: CustomLogger,
+                               columns: Optional[Iterable[str]] = None,
+                               as_tuples: bool = False) -> Iterator[Union[Dict[str, Any], tuple]]:
+    """
+    Streaming form of get_valid_pending_records: yields rows as the cursor downloads
+    them instead of materialising the whole result set.
 
+    The pooled connection is held until the generator is exhausted or closed.
 
+    Args:
+        config (Dict[str, Any]): Configuration dictionary
+        logger (CustomLogger): Logger for critical events
+        columns (Iterable[str] | None): Columns to fetch. Defaults to every column.
+        as_tuples (bool): Yield read-only named tuples (row.PIPELINE_ID) instead of dicts.
 
+    Yields:
+        Dict[str, Any] | tuple: Valid PENDING records, in QUERY_WINDOW_START_TIME order
+    """
 
+    query, params = _valid_pending_records_query(config, columns)
+    return _stream_valid_pending_records(config["sf_drive_config"], logger, query, params, as_tuples)
 
 
+def _stream_valid_pending_records(sf_config: Dict[str, Any], logger: CustomLogger, query: str,
+                                  params: Dict[str, Any], as_tuples: bool) -> Iterator[Union[Dict[str, Any], tuple]]:
+    """Generator body of iter_valid_pending_records; runs the already built query."""
+    table_name = sf_config["table"]
+
+    try:
+        with get_snowflake_connection(sf_config, logger) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
 
+                logger.info(
+                    "Fetched valid PENDING records successfully",
+                    keyword="FETCH_VALID_PENDING_SUCCESS",
+                    other_details={
+                        "query_id": cursor.sfqid,
+                        "records_found": cursor.rowcount
+                    }
+                )
 
+                yield from map(_row_factory(cursor.description, as_tuples), cursor)
 
+    except Exception as e:
+        logger.error(
+            "Exception while fetching valid pending records",
+            keyword="FETCH_VALID_PENDING_FAILED",
+            other_details={
+                "exception_type": type(e).__name__,
+                "exception_message": str(e),
+                "table_name": table_name
+            }
+        )
+        raise
+
+
+def iter_valid_pending_record_batches(config: Dict[str, Any], logger: CustomLogger,
+                                      columns: Optional[Iterable[str]] = None) -> Iterator[Any]:
+    """
+    Columnar form of get_valid_pending_records: yields the result as pyarrow tables,
+    one per downloaded result chunk, without building a Python object per cell.
+
+    Needs pyarrow (snowflake-connector-python[pandas]). The pooled connection is held
+    until the generator is exhausted or closed.
+
+    Args:
+        config (Dict[str, Any]): Configuration dictionary
+        logger (CustomLogger): Logger for critical events
+        columns (Iterable[str] | None): Columns to fetch. Defaults to every column.
+
+    Yields:
+        pyarrow.Table: Valid PENDING records, in QUERY_WINDOW_START_TIME order
+    """
+
+    query, params = _valid_pending_records_query(config, columns)
+    return _stream_valid_pending_record_batches(config["sf_drive_config"], logger, query, params)
+
+
+def _stream_valid_pending_record_batches(sf_config: Dict[str, Any], logger: CustomLogger, query: str,
+                                         params: Dict[str, Any]) -> Iterator[Any]:
+    """Generator body of iter_valid_pending_record_batches; runs the already built query."""
+    table_name = sf_config["table"]
+
+    try:
+        with get_snowflake_connection(sf_config, logger) as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+
+                logger.info(
+                    "Fetching valid PENDING records as arrow batches",
+                    keyword="FETCH_VALID_PENDING_SUCCESS",
+                    other_details={"query_id": cursor.sfqid}
+                )
+
+                yield from cursor.fetch_arrow_batches()
+
+    except Exception as e:
+        logger.error(
+            "Exception while fetching valid pending records",
+            keyword="FETCH_VALID_PENDING_FAILED",
+            other_details={
+                "exception_type": type(e).__name__,
+                "exception_message": str(e),
+                "table_name": table_name
+            }
+        )
+        raise
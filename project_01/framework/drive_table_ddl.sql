@@ -97,4 +97,8 @@ CREATE TABLE IF NOT EXISTS DRIVE_TABLE (
     -- Alerting & Miscellaneous
     EMAIL_ALERTS_SEND_TO VARCHAR(1000) DEFAULT NULL,
     MISCELLANEOUS_DATA VARIANT DEFAULT NULL
-);
\ No newline at end of file
+)
+-- The drive lookups filter on status and source and sort by query window start;
+-- clustering on them lets Snowflake prune micro-partitions for those queries.
+-- For an existing table: ALTER TABLE DRIVE_TABLE CLUSTER BY (PIPELINE_STATUS, SOURCE_NAME, QUERY_WINDOW_START_TIME);
+CLUSTER BY (PIPELINE_STATUS, SOURCE_NAME, QUERY_WINDOW_START_TIME);
\ No newline at end of file
@@ -1,12 +1,232 @@
-from typing import Dict, Any, bool
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from typing import Dict, Any, Callable, Collection, Iterator, List, NamedTuple, Optional, Tuple
 from source_scripts import test_source_connection
 from stage_scripts import test_stage_connection  
 from target_scripts import test_target_connection
 from drive_scripts import test_drive_connection
-from custom_logger import CustomLogger
+from custom_logger import BatchingLoggerProxy, CustomLogger
 from email_alerts import send_email_alert
 
-def check_all_connections(config: Dict[str, Any], logger: CustomLogger) -> Dict[str, bool]:
+
+class ConnectionStatus(NamedTuple):
+    """Availability of each pipeline system, as reported by the connection health check."""
+    source: bool
+    stage: bool
+    target: bool
+    drive: bool
+
+    def as_dict(self) -> Dict[str, bool]:
+        """Returns the legacy dict shape, e.g. {'is_source_connection_available': True, ...}."""
+        return {f"is_{system_name}_connection_available": status for system_name, status in zip(self._fields, self)}
+
+
+# Connection tests run by the health check: (system name, test function).
+# The system name matches a ConnectionStatus field and drives log messages and
+# keywords, e.g. SOURCE_CONNECTION_CRASH.
+CHECKS = (
+    ('source', test_source_connection),
+    ('stage', test_stage_connection),
+    ('target', test_target_connection),
+    ('drive', test_drive_connection),
+)
+
+# Systems whose failure ends the DAG run on its own; once one of them fails
+# there is no point waiting for the other probes
+PIPELINE_CRITICAL_CHECKS = frozenset({'drive'})
+
+# Upper bound in seconds on how long any single connection test may take
+HEALTH_CHECK_TIMEOUT_SEC = 5.0
+
+# Status labels indexed by the boolean test outcome (False -> 0, True -> 1)
+_STATUS_MSG = ("FAILED", "PASSED")
+# Shared, read-only other_details payloads indexed the same way. Kept as plain
+# dicts (not MappingProxyType) so CustomLogger can still json.dumps them; the
+# logger only reads other_details, so sharing them across calls is safe.
+_STATUS_DETAIL = ({"status": False}, {"status": True})
+
+# How long in seconds a completed health check is reused for an identical config;
+# a config can override it with 'connection_cache_ttl_s'
+HEALTH_CHECK_CACHE_TTL_SEC = 10.0
+
+# Config keys that are never part of the cache key (secrets and per-run identifiers)
+_CACHE_KEY_EXCLUDED_MARKERS = ('password', 'secret', 'token', 'private_key')
+_CACHE_KEY_EXCLUDED_KEYS = ('dag_run_id', 'connection_cache_ttl_s')
+
+# cache key -> (monotonic timestamp, connection status)
+_HEALTH_CHECK_CACHE: Dict[str, Tuple[float, ConnectionStatus]] = {}
+_HEALTH_CHECK_CACHE_LOCK = threading.Lock()
+
+
+class _CriticalOnFailure:
+    """
+    Context manager that turns any exception raised in its block into
+    Exception("Critical: <what>: <error>"), the error the preflight raises when
+    it cannot log or alert. Replaces a try/except around each such call.
+    """
+    __slots__ = ('_what',)
+
+    def __init__(self, what: str):
+        self._what = what
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is not None and issubclass(exc_type, Exception):
+            raise Exception(f"Critical: {self._what}: {exc}") from exc
+        return False
+
+
+@contextmanager
+def _critical_batched_logging(logger, what: str) -> Iterator[BatchingLoggerProxy]:
+    """
+    Like custom_logger.batched_logging, but a failure to emit the buffered records is
+    raised through _CriticalOnFailure(what). Buffered log calls cannot fail themselves,
+    so the flush is where a logging failure surfaces.
+    """
+    if isinstance(logger, BatchingLoggerProxy):
+        yield logger
+        return
+    proxy = BatchingLoggerProxy(logger)
+    try:
+        yield proxy
+    finally:
+        with _CriticalOnFailure(what):
+            proxy.flush()
+
+
+def _connection_identity(value: Any) -> Any:
+    """Returns a copy of the config value with secrets and per-run identifiers stripped out."""
+    if isinstance(value, dict):
+        return {
+            k: _connection_identity(v) for k, v in value.items()
+            if k not in _CACHE_KEY_EXCLUDED_KEYS
+            and not any(marker in str(k).lower() for marker in _CACHE_KEY_EXCLUDED_MARKERS)
+        }
+    if isinstance(value, (list, tuple)):
+        return [_connection_identity(v) for v in value]
+    return value
+
+
+def _health_check_cache_key(config: Dict[str, Any]) -> str:
+    """Hashes the connection-identifying part of the config into a cache key."""
+    identity = json.dumps(_connection_identity(config), sort_keys=True, default=str)
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def _get_cached_connection_status(cache_key: str, ttl_sec: float = HEALTH_CHECK_CACHE_TTL_SEC) -> Optional[ConnectionStatus]:
+    """Returns the cached health check result if it is still within the TTL."""
+    with _HEALTH_CHECK_CACHE_LOCK:
+        cached = _HEALTH_CHECK_CACHE.get(cache_key)
+        if cached is None:
+            return None
+        cached_at, status = cached
+        if time.monotonic() - cached_at >= ttl_sec:
+            del _HEALTH_CHECK_CACHE[cache_key]
+            return None
+        return status
+
+
+def _store_connection_status(cache_key: str, status: ConnectionStatus) -> None:
+    """Stores a health check result; ConnectionStatus is immutable so no copy is needed."""
+    with _HEALTH_CHECK_CACHE_LOCK:
+        _HEALTH_CHECK_CACHE[cache_key] = (time.monotonic(), status)
+
+
+@functools.lru_cache(maxsize=16)
+def _enabled_checks(enabled: Optional[frozenset]) -> Tuple[Tuple[str, Callable[[Dict[str, Any]], bool]], ...]:
+    """CHECKS narrowed (once per distinct set) to the enabled system names; None enables all."""
+    if enabled is None:
+        return CHECKS
+    unknown = enabled.difference(ConnectionStatus._fields)
+    if unknown:
+        raise ValueError(f"Unknown systems in 'enabled_connections': {sorted(unknown)}")
+    return tuple(check for check in CHECKS if check[0] in enabled)
+
+
+def _checks_for(config: Dict[str, Any]) -> Tuple[Tuple[str, Callable[[Dict[str, Any]], bool]], ...]:
+    """Connection tests to run for this config; systems it does not enable are never probed."""
+    enabled = config.get('enabled_connections')
+    return _enabled_checks(None if enabled is None else frozenset(enabled))
+
+
+def _timed_connection_test(test_fn: Callable[[Dict[str, Any]], bool], config: Dict[str, Any]) -> Tuple[bool, float]:
+    """Runs a connection test and returns its status with the elapsed time in milliseconds."""
+    started = time.perf_counter()
+    status = test_fn(config)
+    return status, round((time.perf_counter() - started) * 1000, 1)
+
+
+def _is_passing_outcome(outcome: Any) -> bool:
+    """True if a raw probe outcome is a (status, elapsed_ms) pair with a truthy status."""
+    return isinstance(outcome, tuple) and bool(outcome[0])
+
+
+def _resolve_connection_outcome(system_name: str, outcome: Any, logger: CustomLogger) -> Tuple[bool, Optional[float]]:
+    """
+    Turns a raw probe outcome into (status, elapsed_ms) and logs it.
+
+    The outcome is either the (status, elapsed_ms) pair returned by
+    _timed_connection_test or the exception the probe raised; timeouts and
+    crashes are logged as warnings and reported as unavailable.
+    """
+    if isinstance(outcome, (asyncio.TimeoutError, FuturesTimeoutError)):
+        status, elapsed_ms = False, HEALTH_CHECK_TIMEOUT_SEC * 1000
+        _log_connection_timeout(system_name, HEALTH_CHECK_TIMEOUT_SEC, logger)
+    elif isinstance(outcome, BaseException):
+        status, elapsed_ms = False, None
+        _log_connection_crash(system_name, outcome, logger)
+    else:
+        status, elapsed_ms = outcome
+
+    _log_connection_status(system_name, status, logger)
+    return status, elapsed_ms
+
+
+def _log_connection_crash(system_name: str, error: BaseException, logger: CustomLogger) -> None:
+    """Logs a connection test that raised instead of returning a status."""
+    with _CriticalOnFailure(f"Logger failed while recording {system_name} connection crash"):
+        logger.warning(
+            f"{system_name.capitalize()} connection test crashed: {str(error)}",
+            keyword=f"{system_name.upper()}_CONNECTION_CRASH",
+            other_details={"error": str(error)}
+        )
+
+
+def _log_connection_status(system_name: str, status: bool, logger: CustomLogger) -> None:
+    """Logs the PASSED/FAILED outcome of a single connection test at DEBUG level."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    with _CriticalOnFailure(f"Logger failed during {system_name} connection logging"):
+        logger.debug(
+            system_name.capitalize() + " connection test: " + _STATUS_MSG[bool(status)],
+            keyword=f"{system_name.upper()}_CONNECTION_TEST",
+            other_details=_STATUS_DETAIL[bool(status)]
+        )
+
+
+def _log_connection_timeout(system_name: str, timeout_sec: float, logger: CustomLogger) -> None:
+    """Logs a connection test that did not answer within the health check budget."""
+    with _CriticalOnFailure(f"Logger failed while recording {system_name} connection timeout"):
+        logger.warning(
+            f"{system_name.capitalize()} connection test timed out after {timeout_sec}s",
+            keyword=f"{system_name.upper()}_CONNECTION_TIMEOUT",
+            other_details={"timeout_sec": timeout_sec}
+        )
+
+
+def check_all_connections(config: Dict[str, Any],
+                          logger: CustomLogger,
+                          force: bool = False,
+                          critical_checks: Optional[Collection[str]] = None) -> Dict[str, bool]:
     """
     Validates connectivity to all pipeline systems before data processing begins.
     
@@ -15,6 +235,12 @@ def check_all_connections(config: Dict[str, Any], logger: CustomLogger) -> Dict[
     Input: config (Dict[str, Any]) - Configuration dictionary containing connection 
            parameters, credentials, and system endpoints
            logger (CustomLogger) - Logger instance for recording connection test results
+           force (bool) - Skip the short-lived result cache and re-run every test
+           critical_checks (Collection[str] | None) - System names ('source', 'stage',
+           'target', 'drive') whose failure makes the remaining tests pointless; as soon
+           as one of them fails, in-flight tests are abandoned and reported as False
+           Optional config['enabled_connections'] (list of system names) limits the
+           tests to those systems; the others are not probed and reported as False
     
     Output: Dict[str, bool] - Connection status dictionary with boolean flags:
             - is_source_connection_available
@@ -23,127 +249,256 @@ def check_all_connections(config: Dict[str, Any], logger: CustomLogger) -> Dict[
             - is_drive_connection_available
     """
     
+    return get_connection_status(config, logger, force, critical_checks).as_dict()
+
+
+def get_connection_status(config: Dict[str, Any],
+                          logger: CustomLogger,
+                          force: bool = False,
+                          critical_checks: Optional[Collection[str]] = None) -> ConnectionStatus:
+    """
+    Runs the connection health check and returns a ConnectionStatus.
+
+    Same inputs and behaviour as check_all_connections, which is a thin adapter
+    over this function for callers that want the legacy dict shape. Log records
+    are buffered and emitted together when the check finishes.
+    """
+    
+    with _critical_batched_logging(logger, "Logger failed while emitting health check records") as batch:
+        return _get_connection_status(config, batch, force, critical_checks)
+
+
+def _get_connection_status(config: Dict[str, Any],
+                           logger: BatchingLoggerProxy,
+                           force: bool,
+                           critical_checks: Optional[Collection[str]]) -> ConnectionStatus:
+    """Body of get_connection_status; logs through the batching proxy."""
+    
     # Validate required config
     if not config.get('dag_run_id'):
         raise ValueError("Required config field 'dag_run_id' is missing")
     
-    try:
-        logger.info(
+    cache_key = _health_check_cache_key(config)
+    if not force:
+        cached_status = _get_cached_connection_status(
+            cache_key, config.get('connection_cache_ttl_s', HEALTH_CHECK_CACHE_TTL_SEC)
+        )
+        if cached_status is not None:
+            logger.debug(
+                "Connection health check served from cache",
+                keyword="HEALTH_CHECK_CACHE_HIT",
+                other_details=cached_status._asdict()
+            )
+            return cached_status
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
             "Starting connection health check for all pipeline systems",
             keyword="HEALTH_CHECK_START"
         )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during health check start: {e}")
     
-    # Test source connection
+    # Run the connection tests concurrently; they are independent network
+    # probes, so total wall time is bounded by the slowest one instead of the sum.
+    critical = frozenset(critical_checks or ())
+    outcomes: Dict[int, Any] = {}
+    short_circuited_by: Optional[str] = None
+
+    # Bind globals and attributes used inside the loops to locals once per call
+    checks = _checks_for(config)
+    monotonic = time.monotonic
+    timed_test = _timed_connection_test
+    resolve_outcome = _resolve_connection_outcome
+
+    executor = ThreadPoolExecutor(max_workers=max(1, len(checks)))
     try:
-        source_status: bool = test_source_connection(config)
-    except Exception as e:
-        source_status = False
-        try:
-            logger.warning(
-                f"Source connection test crashed: {str(e)}",
-                keyword="SOURCE_CONNECTION_CRASH",
-                other_details={"error": str(e)}
+        submit = executor.submit
+        futures = {
+            submit(timed_test, test_fn, config): index
+            for index, (_, test_fn) in enumerate(checks)
+        }
+        # All probes start together, so they share one deadline
+        deadline = monotonic() + HEALTH_CHECK_TIMEOUT_SEC
+
+        pending = set(futures)
+        while pending and short_circuited_by is None:
+            done, pending = wait(
+                pending,
+                timeout=max(0.0, deadline - monotonic()),
+                return_when=FIRST_COMPLETED
             )
-        except Exception as log_e:
-            raise Exception(f"Critical: Logger failed while recording source connection crash: {log_e}")
-    
-    try:
-        logger.info(
-            f"Source connection test: {'PASSED' if source_status else 'FAILED'}",
-            keyword="SOURCE_CONNECTION_TEST",
-            other_details={"status": source_status}
+            if not done:
+                # Deadline reached; everything still pending is reported as timed out
+                break
+            for future in done:
+                index = futures[future]
+                try:
+                    outcomes[index] = future.result()
+                except Exception as e:
+                    outcomes[index] = e
+                system_name = checks[index][0]
+                if system_name in critical and not _is_passing_outcome(outcomes[index]):
+                    short_circuited_by = system_name
+
+        for future in pending:
+            future.cancel()
+    finally:
+        # Do not block on probes that blew the budget or were short-circuited;
+        # their threads finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # Log and collect in CHECKS order so the logs keep a stable order;
+    # systems that are not enabled stay False
+    statuses = dict.fromkeys(ConnectionStatus._fields, False)
+    events: List[Dict[str, Any]] = []
+    add_event = events.append
+    for index, (system_name, _) in enumerate(checks):
+        if index in outcomes:
+            status, elapsed_ms = resolve_outcome(system_name, outcomes[index], logger)
+            add_event({"system": system_name, "status": status, "elapsed_ms": elapsed_ms})
+        elif short_circuited_by is not None:
+            status = False
+            add_event({"system": system_name, "status": status, "elapsed_ms": None, "skipped": True})
+        else:
+            status, elapsed_ms = resolve_outcome(system_name, FuturesTimeoutError(), logger)
+            add_event({"system": system_name, "status": status, "elapsed_ms": elapsed_ms})
+        statuses[system_name] = status
+    result = ConnectionStatus(**statuses)
+
+    if short_circuited_by is not None:
+        logger.warning(
+            f"Critical {short_circuited_by} connection unavailable - skipped remaining connection tests",
+            keyword="HEALTH_CHECK_SHORT_CIRCUIT",
+            other_details={"critical_check": short_circuited_by}
         )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during source connection logging: {e}")
+
+    logger.info(
+        "Connection health check completed",
+        keyword="HEALTH_CHECK_COMPLETE",
+        other_details={"results": result.as_dict(), "events": events}
+    )
     
-    # Test stage connection
-    try:
-        stage_status: bool = test_stage_connection(config)
-    except Exception as e:
-        stage_status = False
-        try:
-            logger.warning(
-                f"Stage connection test crashed: {str(e)}",
-                keyword="STAGE_CONNECTION_CRASH",
-                other_details={"error": str(e)}
-            )
-        except Exception as log_e:
-            raise Exception(f"Critical: Logger failed while recording stage connection crash: {log_e}")
+    # A short-circuited result has unknown entries, so it must not be reused
+    if short_circuited_by is None:
+        _store_connection_status(cache_key, result)
+    return result
+
+
+def iter_connection_checks(config: Dict[str, Any], logger: CustomLogger) -> Iterator[Tuple[str, bool]]:
+    """
+    Runs the connection tests concurrently and yields results as they complete.
+
+    Lets "first failure wins" callers stop early, e.g.
+    `all(status for _, status in iter_connection_checks(config, logger))`
+    returns as soon as any system is unavailable. Breaking out of the loop (or
+    closing the generator) cancels tests that have not started and stops waiting
+    for the rest. Results are not cached and no summary is logged; use
+    check_all_connections for the full health check.
     
-    try:
-        logger.info(
-            f"Stage connection test: {'PASSED' if stage_status else 'FAILED'}",
-            keyword="STAGE_CONNECTION_TEST", 
-            other_details={"status": stage_status}
-        )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during stage connection logging: {e}")
+    Input: config (Dict[str, Any]) - Configuration dictionary containing connection 
+           parameters, credentials, and system endpoints
+           logger (CustomLogger) - Logger instance for recording connection test results
     
-    # Test target connection
-    try:
-        target_status: bool = test_target_connection(config)
-    except Exception as e:
-        target_status = False
-        try:
-            logger.warning(
-                f"Target connection test crashed: {str(e)}",
-                keyword="TARGET_CONNECTION_CRASH",
-                other_details={"error": str(e)}
-            )
-        except Exception as log_e:
-            raise Exception(f"Critical: Logger failed while recording target connection crash: {log_e}")
+    Output: Iterator[Tuple[str, bool]] - (system name, is available) pairs in
+            completion order; tests still running at HEALTH_CHECK_TIMEOUT_SEC
+            are yielded as unavailable
+    """
     
-    try:
-        logger.info(
-            f"Target connection test: {'PASSED' if target_status else 'FAILED'}",
-            keyword="TARGET_CONNECTION_TEST",
-            other_details={"status": target_status}
-        )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during target connection logging: {e}")
+    if not config.get('dag_run_id'):
+        raise ValueError("Required config field 'dag_run_id' is missing")
     
-    # Test drive connection
+    checks = _checks_for(config)
+    executor = ThreadPoolExecutor(max_workers=max(1, len(checks)))
     try:
-        drive_status: bool = test_drive_connection(config)
-    except Exception as e:
-        drive_status = False
+        futures = {
+            executor.submit(_timed_connection_test, test_fn, config): system_name
+            for system_name, test_fn in checks
+        }
+        remaining = set(futures.values())
         try:
-            logger.warning(
-                f"Drive connection test crashed: {str(e)}",
-                keyword="DRIVE_CONNECTION_CRASH",
-                other_details={"error": str(e)}
-            )
-        except Exception as log_e:
-            raise Exception(f"Critical: Logger failed while recording drive connection crash: {log_e}")
-    
-    try:
-        logger.info(
-            f"Drive connection test: {'PASSED' if drive_status else 'FAILED'}",
-            keyword="DRIVE_CONNECTION_TEST",
-            other_details={"status": drive_status}
+            for future in as_completed(futures, timeout=HEALTH_CHECK_TIMEOUT_SEC):
+                system_name = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = e
+                status, _ = _resolve_connection_outcome(system_name, outcome, logger)
+                remaining.discard(system_name)
+                yield system_name, status
+        except FuturesTimeoutError:
+            for system_name, _ in checks:
+                if system_name in remaining:
+                    status, _ = _resolve_connection_outcome(system_name, FuturesTimeoutError(), logger)
+                    yield system_name, status
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def check_all_connections_async(config: Dict[str, Any], logger: CustomLogger, force: bool = False) -> Dict[str, bool]:
+    """
+    Async variant of check_all_connections for callers already running an event loop.
+
+    The blocking test_*_connection calls are pushed onto worker threads with
+    asyncio.to_thread and fanned out with asyncio.gather, so the event loop stays
+    free while the probes wait on the network. A probe that raises or exceeds
+    HEALTH_CHECK_TIMEOUT_SEC is logged and reported as unavailable.
+
+    Input/Output: same as check_all_connections, including the result cache.
+    """
+
+    # Validate required config
+    if not config.get('dag_run_id'):
+        raise ValueError("Required config field 'dag_run_id' is missing")
+
+    cache_key = _health_check_cache_key(config)
+    if not force:
+        cached_status = _get_cached_connection_status(
+            cache_key, config.get('connection_cache_ttl_s', HEALTH_CHECK_CACHE_TTL_SEC)
         )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during drive connection logging: {e}")
-    
-    result: Dict[str, bool] = {
-        'is_source_connection_available': source_status,
-        'is_stage_connection_available': stage_status, 
-        'is_target_connection_available': target_status,
-        'is_drive_connection_available': drive_status
-    }
-    
-    try:
+        if cached_status is not None:
+            logger.debug(
+                "Connection health check served from cache",
+                keyword="HEALTH_CHECK_CACHE_HIT",
+                other_details=cached_status._asdict()
+            )
+            return cached_status.as_dict()
+
+    if logger.isEnabledFor(logging.DEBUG):
+        with _CriticalOnFailure("Logger failed during health check start"):
+            logger.debug(
+                "Starting connection health check for all pipeline systems",
+                keyword="HEALTH_CHECK_START"
+            )
+
+    checks = _checks_for(config)
+    outcomes = await asyncio.gather(
+        *(
+            asyncio.wait_for(
+                asyncio.to_thread(_timed_connection_test, test_fn, config),
+                timeout=HEALTH_CHECK_TIMEOUT_SEC
+            )
+            for _, test_fn in checks
+        ),
+        return_exceptions=True
+    )
+
+    statuses = dict.fromkeys(ConnectionStatus._fields, False)
+    events: List[Dict[str, Any]] = []
+    for (system_name, _), outcome in zip(checks, outcomes):
+        status, elapsed_ms = _resolve_connection_outcome(system_name, outcome, logger)
+        statuses[system_name] = status
+        events.append({"system": system_name, "status": status, "elapsed_ms": elapsed_ms})
+    result = ConnectionStatus(**statuses)
+
+    with _CriticalOnFailure("Logger failed during health check completion"):
         logger.info(
             "Connection health check completed",
             keyword="HEALTH_CHECK_COMPLETE",
-            other_details=result
+            other_details={"results": result.as_dict(), "events": events}
         )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during health check completion: {e}")
-    
-    return result
+
+    _store_connection_status(cache_key, result)
+    return result.as_dict()
+
 
 def determine_pipeline_capabilities(config: Dict[str, Any], logger: CustomLogger) -> Dict[str, bool]:
     """
@@ -155,53 +510,55 @@ def determine_pipeline_capabilities(config: Dict[str, Any], logger: CustomLogger
     
     Returns:
         Dict with keys: exit_dag, can_process_source_to_stage, can_process_stage_to_target
+
+    Log records (including those of the connection health check) are buffered and
+    emitted together on every exit path.
     """
     
+    with _critical_batched_logging(logger, "Logger failed while emitting capability check records") as batch:
+        return _determine_pipeline_capabilities(config, batch)
+
+
+def _determine_pipeline_capabilities(config: Dict[str, Any], logger: BatchingLoggerProxy) -> Dict[str, bool]:
+    """Body of determine_pipeline_capabilities; logs through the batching proxy."""
+    
     # Validate required config
     if not config.get('dag_run_id'):
         raise ValueError("Required config field 'dag_run_id' is missing")
     
-    # Get connection health status
-    connection_status = check_all_connections(config, logger)
+    # Get connection health status; a dead drive is a hard stop, so stop probing as soon as it fails
+    connection_status = get_connection_status(config, logger, critical_checks=PIPELINE_CRITICAL_CHECKS)
     
     # Extract individual connection flags
-    drive_available   = connection_status.get('is_drive_connection_available', False)
-    source_available  = connection_status.get('is_source_connection_available', False)
-    stage_available   = connection_status.get('is_stage_connection_available', False)
-    target_available  = connection_status.get('is_target_connection_available', False)
+    drive_available   = connection_status.drive
+    source_available  = connection_status.source
+    stage_available   = connection_status.stage
+    target_available  = connection_status.target
     
     # Get DAG run ID for messaging
     dag_run_id = config.get('dag_run_id', 'UNKNOWN')
     
-    try:
-        logger.info(
-            "Starting pipeline capability determination",
-            keyword="CAPABILITY_CHECK_START",
-            other_details=connection_status
-        )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during capability check start: {e}")
+    logger.info(
+        "Starting pipeline capability determination",
+        keyword="CAPABILITY_CHECK_START",
+        other_details=connection_status.as_dict()
+    )
     
     # Case 1: Drive connection missing (mandatory) - hard stop
     if not drive_available:
         message = f"Critical: Drive connection unavailable. Cannot log pipeline status. Exiting DAG run {dag_run_id}. All data transfer operations aborted."
         
-        try:
+        with _CriticalOnFailure("Cannot send alert about drive connection failure"):
             send_email_alert(
                 subject=f"CRITICAL: Pipeline Aborted - Drive Connection Missing - DAG {dag_run_id}",
                 message=message
             )
-        except Exception as e:
-            raise Exception(f"Critical: Cannot send alert about drive connection failure: {e}")
         
-        try:
-            logger.error(
-                "Drive connection unavailable - exiting DAG",
-                keyword="DRIVE_CONNECTION_FAILED",
-                other_details={"dag_run_id": dag_run_id}
-            )
-        except Exception as e:
-            raise Exception(f"Critical: Logger failed while recording drive connection failure: {e}")
+        logger.error(
+            "Drive connection unavailable - exiting DAG",
+            keyword="DRIVE_CONNECTION_FAILED",
+            other_details={"dag_run_id": dag_run_id}
+        )
         
         return {
             'exit_dag': True,
@@ -213,22 +570,17 @@ def determine_pipeline_capabilities(config: Dict[str, Any], logger: CustomLogger
     if not any([source_available, stage_available, target_available]):
         message = f"No data connections available (source, stage, target all unavailable). Cannot perform any data transfer operations. Exiting DAG run {dag_run_id}. Will retry in next scheduled run."
         
-        try:
+        with _CriticalOnFailure("Cannot send alert about no data connections"):
             send_email_alert(
                 subject=f"WARNING: No Data Connections Available - DAG {dag_run_id}",
                 message=message
             )
-        except Exception as e:
-            raise Exception(f"Critical: Cannot send alert about no data connections: {e}")
         
-        try:
-            logger.warning(
-                "No data connections available - exiting DAG",
-                keyword="NO_DATA_CONNECTIONS",
-                other_details={"dag_run_id": dag_run_id}
-            )
-        except Exception as e:
-            raise Exception(f"Critical: Logger failed while recording no data connections: {e}")
+        logger.warning(
+            "No data connections available - exiting DAG",
+            keyword="NO_DATA_CONNECTIONS",
+            other_details={"dag_run_id": dag_run_id}
+        )
         
         return {
             'exit_dag': True,
@@ -259,13 +611,11 @@ def determine_pipeline_capabilities(config: Dict[str, Any], logger: CustomLogger
         subject = f"WARNING: No Data Transfers Possible - DAG {dag_run_id}"
     
     # Send email alert
-    try:
+    with _CriticalOnFailure("Cannot send alert about pipeline capabilities"):
         send_email_alert(subject=subject, message=message)
-    except Exception as e:
-        raise Exception(f"Critical: Cannot send alert about pipeline capabilities: {e}")
     
-    # Log the decision
-    try:
+    # Log the decision (the details dict is only built when INFO is enabled)
+    if logger.isEnabledFor(logging.INFO):
         logger.info(
             "Pipeline capability determination completed",
             keyword="CAPABILITY_CHECK_COMPLETE",
@@ -276,8 +626,6 @@ def determine_pipeline_capabilities(config: Dict[str, Any], logger: CustomLogger
                 "exit_dag": False
             }
         )
-    except Exception as e:
-        raise Exception(f"Critical: Logger failed during capability check completion: {e}")
     
     return {
         'exit_dag': False,
@@ -1,81 +1,141 @@
-from datetime import datetime
-from typing import Dict, Any, List
-import pytz
-import re
-import copy
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Tuple
+from zoneinfo import ZoneInfo
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # we need these to run this script file
-from drive_scripts import find_in_progress_records, delete_old_in_process_record_and_insert_new_pending_record
+from drive_scripts import find_in_process_records, delete_old_in_process_record_and_insert_new_pending_record, bulk_update_stale_records, parse_duration_string_to_seconds, STALE_DETECTION_COLUMNS
 from email_alerts import send_stale_process_alert
 from custom_logger import CustomLogger
 
 
+# Matches the Snowflake connection pool's idle size, so the workers reuse pooled
+# sessions instead of logging in and closing extra ones on every fallback run.
+# A config can override it with 'stale_conversion_workers'.
+STALE_CONVERSION_MAX_WORKERS = 4
+
+# Records per bulk MERGE. The MERGE inlines every record and PIPELINE_ID in its text, so
+# chunking keeps statements (and the rows they lock) bounded; 'stale_chunk_size' overrides it
+STALE_CONVERSION_CHUNK_SIZE = 500
+
+# Consecutive per-record failures after which the fallback stops submitting updates;
+# at that point Snowflake itself is most likely unreachable
+STALE_CONVERSION_MAX_CONSECUTIVE_FAILURES = 5
+
+# What a malformed in-progress record can raise while being checked for staleness:
+# a missing key, an unparseable duration or timestamp, or a value of the wrong type
+_RECORD_PARSE_ERRORS = (KeyError, ValueError, TypeError)
+
+# Top-level fields every stale record gets, applied with one dict.update
+_PIPELINE_RESET_FIELDS = {
+    'PIPELINE_STATUS': 'PENDING',
+    'PIPELINE_START_TIME': None,
+    'PIPELINE_END_TIME': None,
+    'PIPELINE_DURATION': None,
+}
+
+# All phases and their associated fields, as reset by mark_record_as_pending
+_PHASE_KEYS = (
+    ('SRC_STG_XFER_STATUS', 'SRC_STG_XFER_START_TS', 'SRC_STG_XFER_END_TS', 'SRC_STG_XFER_DURATION'),
+    ('SRC_STG_AUDIT_STATUS', 'SRC_STG_AUDIT_START_TS', 'SRC_STG_AUDIT_END_TS', 'SRC_STG_AUDIT_DURATION'),
+    ('STG_TGT_XFER_STATUS', 'STG_TGT_XFER_START_TS', 'STG_TGT_XFER_END_TS', 'STG_TGT_XFER_DURATION'),
+    ('STG_TGT_AUDIT_STATUS', 'STG_TGT_AUDIT_START_TS', 'STG_TGT_AUDIT_END_TS', 'STG_TGT_AUDIT_DURATION'),
+    ('SRC_TGT_AUDIT_STATUS', 'SRC_TGT_AUDIT_START_TS', 'SRC_TGT_AUDIT_END_TS', 'SRC_TGT_AUDIT_DURATION'),
+)
+
+
+class StaleParseError(ValueError):
+    """A duration string with no recognised d/h/m/s unit."""
+
+
+@functools.lru_cache(maxsize=32)
+def _tz(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
 def detect_and_handle_stale_records(config: Dict[str, Any], logger: CustomLogger) -> Dict[str, int]:
     """
     Main entry point to detect and handle stale in-progress records.
+
+    Only in-progress records the warehouse already considers stale candidates are
+    fetched, so "candidates_found" counts those candidates, not every in-progress record.
+    A failed stale alert is logged (STALE_ALERT_FAILED, with the stale PIPELINE_IDs)
+    rather than raised, since the records are converted to PENDING either way.
     """
 
-    print("STEP 1: Fetching in-progress records...")
     in_progress_records = get_in_progress_records(config, logger)
-    print(f"INFO: Total in-progress records found = {len(in_progress_records)}")
+    logger.debug(f"Total stale candidate records found = {len(in_progress_records)}", keyword="STALE_STEP_FETCH")
 
     if not in_progress_records:
-        logger.info("No in-progress records found.", keyword="NO_IN_PROGRESS")
-        return {"total_found": 0, "stale_found": 0, "converted_count": 0}
+        logger.info("No stale candidate records found.", keyword="NO_STALE_CANDIDATES")
+        return {"candidates_found": 0, "stale_found": 0, "converted_count": 0}
 
-    print("STEP 2: Identifying stale records...")
     stale_records = identify_stale_records_from_list(in_progress_records, config, logger)
-    print(f"INFO: Total stale records identified = {len(stale_records)}")
+    logger.debug(f"Total stale records identified = {len(stale_records)}", keyword="STALE_STEP_IDENTIFY")
 
     if not stale_records:
-        print("No stale records found to process.")
-        return {"total_found": len(in_progress_records), "stale_found": 0, "converted_count": 0}
-
-    print("STEP 3: Sending alert for stale records...")
-    send_stale_process_alert(stale_records, config)
-
-    print("STEP 4: Converting stale records to pending...")
-    original_records = copy.deepcopy(stale_records)
-    converted_count = convert_all_stale_to_pending(stale_records, original_records, config, logger)
-
-    print(f"DONE: Total converted to pending = {converted_count}")
+        return {"candidates_found": len(in_progress_records), "stale_found": 0, "converted_count": 0}
+
+    # The alert only reads the stale records (conversion works on copies), so send it
+    # while the records are converted rather than before. Once converted the records are
+    # no longer IN_PROCESS and no later run alerts on them, so a failed alert is logged
+    # with their PIPELINE_IDs instead of raised and the counts are still returned
+    with ThreadPoolExecutor(max_workers=1) as alert_executor:
+        alert = alert_executor.submit(send_stale_process_alert, stale_records, config)
+        converted_count = convert_all_stale_to_pending(stale_records, config, logger)
+        try:
+            alert.result()
+        except Exception as e:
+            logger.error(
+                f"Stale process alert failed: {str(e)}",
+                keyword="STALE_ALERT_FAILED",
+                other_details={
+                    "exception_message": str(e),
+                    "pipeline_ids": [record.get("PIPELINE_ID") for record in stale_records]
+                }
+            )
+    logger.debug(f"Total converted to pending = {converted_count}", keyword="STALE_STEP_CONVERT")
 
     return {
-        "total_found": len(in_progress_records),
+        "candidates_found": len(in_progress_records),
         "stale_found": len(stale_records),
         "converted_count": converted_count
     }
 
 
 def get_in_progress_records(config: Dict[str, Any], logger: CustomLogger) -> List[Dict[str, Any]]:
-    print("Calling find_in_progress_records()...")
-    return find_in_progress_records(config)
+    # Let the warehouse drop records that cannot be stale yet; identify_stale_records_from_list
+    # still applies the exact per-record check to what comes back. Only the columns stale
+    # detection reads or resets are fetched; the conversion diff never touches any other
+    return find_in_process_records(config, logger, columns=STALE_DETECTION_COLUMNS, stale_only=True)
 
 
 def identify_stale_records_from_list(records: List[Dict[str, Any]], config: Dict[str, Any], logger: CustomLogger) -> List[Dict[str, Any]]:
     stale_records = []
     timezone = config.get("timezone", "UTC")
-    tz = pytz.timezone(timezone)
+    tz = _tz(timezone)
     now = datetime.now(tz)
     stale_factor = config.get("stale_threshold_factor", 3)
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
-    for i, record in enumerate(records, 1):
+    if not debug_enabled:
         try:
-            print(f"\n[Record #{i}] Checking staleness...")
+            return _select_stale_records(records, config, tz, now, stale_factor)
+        except _RECORD_PARSE_ERRORS:
+            # Some row has a missing or unparseable field; the per-record loop
+            # below skips it and reports which one
+            pass
 
+    for i, record in enumerate(records, 1):
+        try:
             duration_str = record.get("PIPELINE_EXP_DURATION") or config["PIPELINE_EXP_DURATION"]
             expected_secs = parse_duration_to_seconds(duration_str)
-            start_time = datetime.fromisoformat(record["PIPELINE_START_TIME"])
+            start_time = _as_aware_datetime(record["PIPELINE_START_TIME"], tz)
             actual_secs = (now - start_time).total_seconds()
 
-            print(f"  Expected: {expected_secs}s | Actual: {actual_secs}s | Factor: {stale_factor}")
-            if actual_secs > expected_secs * stale_factor:
-                print("  --> Marked as STALE")
-                stale_records.append(record)
-            else:
-                print("  --> Still in progress")
-
-        except Exception as e:
+        except _RECORD_PARSE_ERRORS as e:
             logger.warning(
                 f"Error parsing record for staleness: {str(e)}",
                 keyword="STALE_PARSE_ERROR",
@@ -83,29 +143,66 @@ def identify_stale_records_from_list(records: List[Dict[str, Any]], config: Dict
             )
             continue
 
+        is_stale = actual_secs > expected_secs * stale_factor
+        if is_stale:
+            stale_records.append(record)
+
+        if debug_enabled:
+            logger.debug(
+                f"Record #{i}: expected {expected_secs}s, actual {actual_secs}s, factor {stale_factor}",
+                keyword="STALE_CHECK",
+                other_details={"record_index": i, "is_stale": is_stale}
+            )
+
     return stale_records
 
 
-def parse_duration_to_seconds(duration_str: str) -> int:
-    print(f"Parsing duration string: {duration_str}")
-    total = 0
-
-    matchers = {
-        'd': 86400,
-        'h': 3600,
-        'm': 60,
-        's': 1
-    }
+def _select_stale_records(records: List[Dict[str, Any]], config: Dict[str, Any],
+                          tz: ZoneInfo, now: datetime, stale_factor: float) -> List[Dict[str, Any]]:
+    """
+    Fast path for identify_stale_records_from_list when nothing is logged per record.
+
+    A record is stale when now - start > expected * factor, i.e. start < now - expected * factor.
+    Records share only a few expected durations, so that cutoff is computed once per distinct
+    duration string and each record costs a single datetime comparison. Raises on the first
+    unparseable record; the caller then falls back to the per-record loop.
+    """
+    cutoffs: Dict[str, datetime] = {}
+    stale_records = []
 
-    for unit, factor in matchers.items():
-        match = re.search(fr"(\d+){unit}", duration_str)
-        if match:
-            value = int(match.group(1))
-            total += value * factor
-            print(f"  Found {value}{unit} = {value * factor} seconds")
+    for record in records:
+        duration_str = record.get("PIPELINE_EXP_DURATION") or config["PIPELINE_EXP_DURATION"]
+        cutoff = cutoffs.get(duration_str)
+        if cutoff is None:
+            cutoff = now - timedelta(seconds=parse_duration_to_seconds(duration_str) * stale_factor)
+            cutoffs[duration_str] = cutoff
+
+        if _as_aware_datetime(record["PIPELINE_START_TIME"], tz) < cutoff:
+            stale_records.append(record)
+
+    return stale_records
+
+
+def _as_aware_datetime(value: Any, tz: ZoneInfo) -> datetime:
+    # The connector usually hands back datetimes already; only parse strings
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        raise TypeError(f"Expected a datetime or ISO string, got {type(value).__name__}")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz)
+    return value
+
+
+def parse_duration_to_seconds(duration_str: str) -> int:
+    # drive_scripts parses (and caches) the string; a zero duration cannot be stale-checked
+    try:
+        total = parse_duration_string_to_seconds(duration_str)
+    except ValueError as e:
+        raise StaleParseError(str(e)) from e
 
     if total == 0:
-        raise ValueError(f"No valid time unit found in: '{duration_str}'")
+        raise StaleParseError(f"No valid time unit found in: '{duration_str}'")
 
     return total
 
@@ -115,33 +212,15 @@ def mark_record_as_pending(record: Dict[str, Any]) -> None:
     Resets the appropriate parts of a stale record to prepare it for reprocessing.
     Skips any phase that is already marked as 'COMPLETED'.
     """
-    print(f"\nMarking PIPELINE_ID={record.get('PIPELINE_ID')} as PENDING...")
-
     # Always reset top-level pipeline status
-    print("Resetting pipeline-level status and timing...")
-    record['PIPELINE_STATUS'] = 'PENDING'
-    record['PIPELINE_START_TIME'] = None
-    record['PIPELINE_END_TIME'] = None
-    record['PIPELINE_DURATION'] = None
-
-    # Define all phases and their associated fields
-    phase_keys = [
-        ('SRC_STG_XFER_STATUS', 'SRC_STG_XFER_START_TS', 'SRC_STG_XFER_END_TS', 'SRC_STG_XFER_DURATION'),
-        ('SRC_STG_AUDIT_STATUS', 'SRC_STG_AUDIT_START_TS', 'SRC_STG_AUDIT_END_TS', 'SRC_STG_AUDIT_DURATION'),
-        ('STG_TGT_XFER_STATUS', 'STG_TGT_XFER_START_TS', 'STG_TGT_XFER_END_TS', 'STG_TGT_XFER_DURATION'),
-        ('STG_TGT_AUDIT_STATUS', 'STG_TGT_AUDIT_START_TS', 'STG_TGT_AUDIT_END_TS', 'STG_TGT_AUDIT_DURATION'),
-        ('SRC_TGT_AUDIT_STATUS', 'SRC_TGT_AUDIT_START_TS', 'SRC_TGT_AUDIT_END_TS', 'SRC_TGT_AUDIT_DURATION')
-    ]
-
-    for status_key, start_ts_key, end_ts_key, duration_key in phase_keys:
+    record.update(_PIPELINE_RESET_FIELDS)
+
+    for status_key, start_ts_key, end_ts_key, duration_key in _PHASE_KEYS:
         current_status = record.get(status_key)
-        print(f"Checking phase: {status_key} = {current_status}")
 
         if current_status == 'COMPLETED':
-            print(f"  Skipping {status_key} — already completed.")
             continue
 
-        print(f"  Resetting {status_key} to 'PENDING' and clearing timestamps/duration...")
         record[status_key] = 'PENDING'
         record[start_ts_key] = None
         record[end_ts_key] = None
@@ -149,33 +228,140 @@ def mark_record_as_pending(record: Dict[str, Any]) -> None:
 
     # Increment retry attempt number safely
     record['RETRY_ATTEMPT_NUMBER'] = (record.get('RETRY_ATTEMPT_NUMBER') or 0) + 1
-    print(f"Updated RETRY_ATTEMPT_NUMBER: {record['RETRY_ATTEMPT_NUMBER']}")
+
+
+def pending_version(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns a new record with mark_record_as_pending applied, leaving `record` untouched.
+    The fields are top-level scalars, so a shallow copy is a complete copy.
+    """
+    updated = dict(record)
+    mark_record_as_pending(updated)
+    return updated
 
 
 def convert_all_stale_to_pending(stale_records: List[Dict[str, Any]],
-                                  original_records: List[Dict[str, Any]],
                                   config: Dict[str, Any],
                                   logger: CustomLogger) -> int:
+    """
+    Writes the PENDING version of every stale record to the drive table.
+
+    stale_records is not modified; it serves as the before image the updates are
+    diffed against.
+
+    Returns:
+        int: Number of records converted.
+    """
+    updated_records = [pending_version(record) for record in stale_records]
+    chunk_size = config.get("stale_chunk_size", STALE_CONVERSION_CHUNK_SIZE)
+    max_workers = config.get("stale_conversion_workers", STALE_CONVERSION_MAX_WORKERS)
     converted = 0
 
-    for i, record in enumerate(stale_records):
+    # One MERGE per chunk, each committed on its own; a failed chunk wrote nothing, so
+    # only that chunk falls back to per-record updates to convert whatever it can. Once a
+    # fallback trips the consecutive-failure breaker, the remaining chunks are skipped
+    for start in range(0, len(updated_records), chunk_size):
+        original_chunk = stale_records[start:start + chunk_size]
+        updated_chunk = updated_records[start:start + chunk_size]
         try:
-            print(f"\nConverting stale record {i + 1}/{len(stale_records)}...")
-            mark_record_as_pending(record)
-            delete_old_in_process_record_and_insert_new_pending_record(original_records[i], record, config, logger)
-            print(" Conversion success.")
-            converted += 1
+            bulk_update_stale_records(original_chunk, updated_chunk, config, logger)
+            converted += len(updated_chunk)
+            continue
 
         except Exception as e:
-            logger.error(
-                f"Failed to convert stale record: {str(e)}",
-                keyword="CONVERT_TO_PENDING_FAILED",
-                other_details={"record_index": i}
+            logger.warning(
+                f"Bulk conversion failed, falling back to per-record updates: {str(e)}",
+                keyword="CONVERT_TO_PENDING_BULK_FAILED",
+                other_details={"record_count": len(updated_chunk), "chunk_start": start}
             )
-            print(" Conversion failed.")
+
+        chunk_converted, aborted = _convert_stale_records_parallel(
+            original_chunk, updated_chunk, config, logger, max_workers
+        )
+        converted += chunk_converted
+        if aborted:
+            skipped_starts = list(range(start + chunk_size, len(updated_records), chunk_size))
+            if skipped_starts:
+                logger.error(
+                    f"Stale conversion aborted - {len(skipped_starts)} remaining chunks not attempted",
+                    keyword="CONVERT_TO_PENDING_CHUNKS_SKIPPED",
+                    other_details={
+                        "chunk_starts": skipped_starts,
+                        "record_count": len(updated_records) - start - chunk_size
+                    }
+                )
+            break
 
     return converted
 
 
+def convert_stale_records_parallel(original_records: List[Dict[str, Any]],
+                                   updated_records: List[Dict[str, Any]],
+                                   config: Dict[str, Any],
+                                   logger: CustomLogger,
+                                   max_workers: int = STALE_CONVERSION_MAX_WORKERS) -> int:
+    """
+    Writes each updated record with its own UPDATE, several at a time.
+
+    The per-record updates are independent and each one mostly waits on Snowflake, so
+    running them on a small thread pool (each worker borrows its own pooled connection)
+    cuts wall time to roughly serial_time / max_workers. Failures are logged per record
+    and do not stop the others, unless STALE_CONVERSION_MAX_CONSECUTIVE_FAILURES fail in a
+    row: then the updates not yet started are cancelled instead of each waiting out its own
+    connection timeout.
+
+    Returns:
+        int: Number of records converted successfully.
+    """
+    converted, _ = _convert_stale_records_parallel(original_records, updated_records, config, logger, max_workers)
+    return converted
+
 
+def _convert_stale_records_parallel(original_records: List[Dict[str, Any]],
+                                    updated_records: List[Dict[str, Any]],
+                                    config: Dict[str, Any],
+                                    logger: CustomLogger,
+                                    max_workers: int) -> Tuple[int, bool]:
+    """Body of convert_stale_records_parallel; also reports whether the breaker tripped."""
+    if not updated_records:
+        return 0, False
+
+    def convert(i: int) -> None:
+        delete_old_in_process_record_and_insert_new_pending_record(original_records[i], updated_records[i], config, logger)
+
+    consecutive_failures = 0
+    aborted = False
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(updated_records))) as executor:
+        futures = {executor.submit(convert, i): i for i in range(len(updated_records))}
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is None:
+                consecutive_failures = 0
+                continue
 
+            logger.error(
+                f"Failed to convert stale record: {str(error)}",
+                keyword="CONVERT_TO_PENDING_FAILED",
+                other_details={"record_index": futures[future]}
+            )
+            consecutive_failures += 1
+            if consecutive_failures >= STALE_CONVERSION_MAX_CONSECUTIVE_FAILURES:
+                cancelled = sum(f.cancel() for f in futures)
+                logger.error(
+                    f"{consecutive_failures} stale record updates failed in a row - aborting the remaining {cancelled}",
+                    keyword="CONVERT_TO_PENDING_ABORTED",
+                    other_details={"cancelled": cancelled}
+                )
+                aborted = True
+                break
+
+    # Leaving the pool waits for updates that were already running when the batch was
+    # aborted, so every future that was not cancelled has finished by now
+    converted = sum(1 for f in futures if not f.cancelled() and f.exception() is None)
+
+    logger.info(
+        f"Converted {converted} of {len(updated_records)} stale records with per-record updates",
+        keyword="CONVERT_TO_PENDING_SUMMARY",
+        other_details={"total": len(updated_records), "ok": converted, "failed": len(updated_records) - converted}
+    )
+    return converted, aborted
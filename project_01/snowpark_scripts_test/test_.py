@@ -1,7 +1,3 @@
-import pendulum
-from datetime import timedelta
-from snowflake.snowpark.types import StructType, StructField, StringType
-
 def main(session):
     bucket_name = "my-bucket"
     target_day = "2025-07-24"
@@ -9,27 +5,34 @@ def main(session):
     interval_minutes = 15
     table_name = "your_existing_table"
 
-    base = pendulum.parse(f"{target_day}T00:00:00", tz=timezone)
-
-    records = []
     intervals_per_day = int(24 * 60 / interval_minutes)
 
-    for i in range(intervals_per_day):
-        start = base.add(minutes=i * interval_minutes)
-        end = base.add(minutes=(i + 1) * interval_minutes)
-        start_iso = start.to_iso8601_string()
-        end_iso = end.to_iso8601_string()
-        hh_mm = start.format("HH-mm")
-        c3 = f"s3://{bucket_name}/{target_day}/{hh_mm}"
-        records.append((start_iso, end_iso, c3))
-
-    schema = StructType([
-        StructField("start_time", StringType()),
-        StructField("end_time", StringType()),
-        StructField("c3", StringType())
-    ])
-
-    df = session.create_dataframe(records, schema)
+    # Generate the intervals on the warehouse instead of building rows in Python and
+    # uploading them. ROW_NUMBER keeps the sequence gap-free (SEQ4 alone does not
+    # guarantee that); CONVERT_TIMEZONE keeps the local offset right across DST changes.
+    df = session.sql(f"""
+        WITH intervals AS (
+            SELECT
+                TIMESTAMP_TZ_FROM_PARTS(
+                    YEAR(d), MONTH(d), DAY(d), 0, 0, 0, 0, '{timezone}'
+                ) AS day_start,
+                ROW_NUMBER() OVER (ORDER BY SEQ4()) - 1 AS i
+            FROM TABLE(GENERATOR(ROWCOUNT => {intervals_per_day})),
+                (SELECT '{target_day}'::DATE AS d)
+        ),
+        bounds AS (
+            SELECT
+                CONVERT_TIMEZONE('{timezone}', DATEADD(minute, i * {interval_minutes}, day_start)) AS start_ts,
+                CONVERT_TIMEZONE('{timezone}', DATEADD(minute, (i + 1) * {interval_minutes}, day_start)) AS end_ts
+            FROM intervals
+        )
+        SELECT
+            TO_VARCHAR(start_ts, 'YYYY-MM-DD"T"HH24:MI:SSTZH:TZM') AS start_time,
+            TO_VARCHAR(end_ts, 'YYYY-MM-DD"T"HH24:MI:SSTZH:TZM') AS end_time,
+            's3://{bucket_name}/{target_day}/' || TO_VARCHAR(start_ts, 'HH24-MI') AS c3
+        FROM bounds
+        ORDER BY start_ts
+    """)
     df.write.mode("append").save_as_table(table_name)
 
     return df